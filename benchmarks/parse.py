@@ -0,0 +1,123 @@
+"""
+Measures how long it takes to validate and parse large generated test case files into test cases.
+
+Usage: `python benchmarks/parse.py [--against <git revision>] [cases ...]`
+
+With `--against`, the same measurements are taken on the given revision, checked out in a temporary git worktree,
+and both are printed along with the speedup.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pysvt import test
+
+ROOT = Path(__file__).resolve().parent.parent
+KINDS = ("[[cases]]", "flat")
+
+
+def cases_fixture(total: int) -> dict:
+    return {
+        "cases": [
+            {"i": [i, [i, i + 1]], "o": i * 2, "name": "Case", "timeout": 1.0}
+            for i in range(total)
+        ]
+    }
+
+
+def flat_fixture(total: int) -> dict:
+    return {
+        "i": [[i, [i, i + 1]] for i in range(total)],
+        "o": [i * 2 for i in range(total)],
+        "metadata": "Generated",
+    }
+
+
+def measure(fixture: dict, repeats: int = 5) -> float:
+    suite = test(data=fixture)
+    times = []
+
+    for _ in range(repeats):
+        suite._data = []
+        start = time.perf_counter()
+        # Revisions before the single pass validation parsed the raw data directly
+        if hasattr(suite, "_normalize"):
+            suite._parse(suite._normalize(fixture), False)
+        else:
+            suite._parse(fixture, False)
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def measure_all(totals: list[int]) -> dict[str, float]:
+    results = {}
+
+    for total in totals:
+        for kind, make in zip(KINDS, (cases_fixture, flat_fixture)):
+            results[f"{kind} {total}"] = measure(make(total))
+
+    return results
+
+
+def measure_revision(revision: str, totals: list[int]) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as directory:
+        worktree = Path(directory) / "tree"
+        subprocess.run(
+            ["git", "worktree", "add", "--detach", "-q", str(worktree), revision],
+            cwd=ROOT,
+            check=True,
+        )
+
+        try:
+            output = subprocess.run(
+                [sys.executable, __file__, "--json", *map(str, totals)],
+                env={**os.environ, "PYTHONPATH": str(worktree)},
+                cwd=worktree,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        finally:
+            subprocess.run(
+                ["git", "worktree", "remove", "--force", str(worktree)],
+                cwd=ROOT,
+                check=True,
+            )
+
+    return json.loads(output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("totals", nargs="*", type=int)
+    parser.add_argument("--against", metavar="REVISION")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    totals = args.totals or [10_000, 100_000, 300_000]
+    results = measure_all(totals)
+
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    before = None if args.against is None else measure_revision(args.against, totals)
+
+    for key, seconds in results.items():
+        kind, total = key.rsplit(" ", 1)
+        line = f"{kind:>10} {int(total):>8} cases: {seconds * 1000:9.1f} ms ({int(total) / seconds:,.0f} cases/s)"
+
+        if before is not None:
+            line += f" vs {before[key] * 1000:9.1f} ms ({before[key] / seconds:.2f}x)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
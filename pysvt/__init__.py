@@ -4,6 +4,17 @@ This module contains the `test` decorator class and supporting functions for val
 Classes:
 - `ValidationError`: Custom exception class for validation errors.
 - `test`: Decorator class for defining and running test cases.
+- `Reporter`: Base class for writing the results to files.
+- `JsonLinesReporter`: Writes the results as JSON Lines.
+- `JUnitXmlReporter`: Writes the results as a JUnit XML report.
+
+Functions:
+- `run_all`: Runs every lazy test.
+
+Objects:
+- `fixture_cache`: The cache of parsed test case files, see `test(cache=True)`.
 """
 
-from .__main__ import ValidationError, test
+from .runner import ValidationError, run_all, test
+from .utils.cache import fixture_cache
+from .utils.reporters import JsonLinesReporter, JUnitXmlReporter, Reporter
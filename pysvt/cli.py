@@ -0,0 +1,320 @@
+import argparse
+import importlib
+import importlib.util
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+import pysvt.runner as runner
+from pysvt.utils.discovery import discover
+from pysvt.utils.printer import Printer
+from pysvt.utils.watch import Watcher, snapshot
+
+
+def _load(module: str, reload: bool = False) -> list[runner.test]:
+    """
+    Imports a module, unless it was imported already, and returns the lazy tests it registered.
+
+    With `reload`, a module imported already is executed again and registers its tests anew.
+    """
+    if reload or module not in sys.modules:
+        # Tests registered by an earlier execution of the module are replaced by the new ones
+        runner.registry[:] = [
+            suite for suite in runner.registry if suite._module != module
+        ]
+
+    if reload and module in sys.modules:
+        importlib.reload(sys.modules[module])
+    else:
+        importlib.import_module(module)
+
+    return [suite for suite in runner.registry if suite._module == module]
+
+
+def _print_error(module: str) -> None:
+    runner.console.print(f"{Printer.error('Error')} in {module}")
+    runner.console.print_exception()
+
+
+def _run_suites(module: str, suites: list[runner.test]) -> tuple[int, int, int, int]:
+    """
+    Runs the given tests of a module.
+
+    An error raised while running a test is printed and counted as a failure.
+
+    Args:
+        module (str): The name of the module.
+        suites (list[test]): The tests.
+
+    Returns:
+        tuple[int, int, int, int]: The number of tests which ran, test cases, failed test cases and skipped test cases.
+    """
+    ran = total = failures = skipped = 0
+
+    try:
+        for suite in suites:
+            suite_total, suite_failures = suite.run()
+            ran += 1 if suite_total or suite._skipped else 0
+            total += suite_total
+            failures += suite_failures
+            skipped += suite._skipped
+    except Exception:
+        _print_error(module)
+        failures += 1
+
+    return ran, total, failures, skipped
+
+
+def _run_module(
+    module: str,
+    loaded: dict[str, list[runner.test]] | None = None,
+    reload: bool = False,
+) -> tuple[int, int, int, int]:
+    """
+    Imports (or reloads) a module and runs its lazy tests.
+
+    An error raised while importing the module is printed and counted as a failure.
+
+    Args:
+        module (str): The name of the module.
+        loaded (dict[str, list[test]] or None): Filled with the tests of the module, by its name. Default is None.
+        reload (bool): Flag indicating whether to reload the module if it was imported already. Default is False.
+
+    Returns:
+        tuple[int, int, int, int]: The number of tests which ran, test cases, failed test cases and skipped test cases.
+    """
+    try:
+        suites = _load(module, reload)
+    except Exception:
+        _print_error(module)
+        return 0, 0, 1, 0
+
+    if loaded is not None:
+        loaded[module] = suites
+
+    return _run_suites(module, suites)
+
+
+def _run_captured(module: str) -> tuple[str, tuple[int, int, int, int]]:
+    """
+    Runs a module in a worker process, capturing what it prints so that modules running in parallel do not mix
+    their output.
+
+    The reporters of its tests are closed before returning, since worker processes exit without running `atexit`.
+    """
+    loaded: dict[str, list[runner.test]] = {}
+
+    with runner.console.capture() as capture:
+        counts = _run_module(module, loaded)
+
+    reporters = {
+        id(reporter): reporter
+        for suite in loaded.get(module, [])
+        for reporter in suite._reporters
+    }
+    for reporter in reporters.values():
+        reporter.close()
+
+    return capture.get(), counts
+
+
+def _summarize(counts: list[tuple[int, int, int, int]], modules: int) -> int:
+    """
+    Prints the combined summary of several tests, if more than one ran, and returns the number of failures.
+    """
+    suites, total, failures, skipped = (
+        sum(column) for column in zip(*counts or [(0, 0, 0, 0)])
+    )
+
+    if suites > 1:
+        runner.console.rule(f"{suites} tests in {modules} modules")
+        Printer(runner.console).finish(total, failures, skipped=skipped)
+
+    return failures
+
+
+def _module_path(module: str) -> Path | None:
+    try:
+        spec = importlib.util.find_spec(module)
+    except (ImportError, ValueError):
+        return None
+
+    if spec is None or spec.origin is None:
+        return None
+    return Path(spec.origin).resolve()
+
+
+def _watch(modules: list[str]) -> None:
+    """
+    Runs the tests of the modules, then re-runs the affected tests whenever a module or a test case file changes,
+    until interrupted.
+
+    Changed modules are reloaded and all of their tests run again. Tests whose test case file changed run again
+    without reloading their module.
+
+    Args:
+        modules (list[str]): The names of the modules.
+    """
+    # Bytecode written for a module edited twice within its timestamp resolution would be reloaded stale
+    sys.dont_write_bytecode = True
+    loaded: dict[str, list[runner.test]] = {}
+    # Taken before running, so that the files edited while the tests run are run again afterwards
+    mtimes = snapshot(path for path in map(_module_path, modules) if path is not None)
+    _summarize([_run_module(module, loaded) for module in modules], len(modules))
+
+    while True:
+        module_paths = {module: _module_path(module) for module in modules}
+        fixtures = [
+            (module, suite, Path(suite._raw).resolve())
+            for module, suites in loaded.items()
+            for suite in suites
+            if isinstance(suite._raw, Path)
+        ]
+        paths = {path for path in module_paths.values() if path is not None}
+        paths |= {path for _, _, path in fixtures}
+
+        with Watcher(paths, since=mtimes) as watcher:
+            runner.console.rule(
+                f"Watching {len(watcher.paths)} files for changes, press Ctrl+C to stop"
+            )
+            changed = watcher.wait()
+
+        mtimes = snapshot(paths)
+
+        for path in sorted(changed):
+            runner.console.print(f"{Printer.bold('Changed')} - {os.path.relpath(path)}")
+
+        reloaded = [module for module in modules if module_paths[module] in changed]
+        counts = [_run_module(module, loaded, reload=True) for module in reloaded]
+        affected = set(reloaded)
+
+        for module, suite, path in fixtures:
+            if path in changed and module not in reloaded:
+                counts.append(_run_suites(module, [suite]))
+                affected.add(module)
+
+        _summarize(counts, len(affected))
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Imports the given modules with lazy tests, or the modules with tests found in the given directories, and runs
+    all of them, one module per worker process with `--jobs`.
+
+    Exits with status 1 if any test case failed.
+
+    Args:
+        argv (list[str] | None): The command line arguments. Default is None (`sys.argv`).
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m pysvt", description="Run the pysvt tests of Python modules."
+    )
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        default=["."],
+        help="module names, paths of Python files or directories to search for tests (default: the current directory)",
+    )
+    parser.add_argument(
+        "-k",
+        dest="keyword",
+        metavar="PATTERN",
+        help="only run the tests whose qualified name, or the test cases whose name or metadata, match a glob or substring",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="run N modules at a time in worker processes, or one per CPU with 0 (default: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="skip the test cases which passed in a previous run with unchanged code and data",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="run every test case, even when running incrementally",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running, and run the affected tests again whenever a module or a test case file changes",
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="record the actual outputs of the test cases referencing snapshots, overwriting the snapshots",
+    )
+    parser.add_argument(
+        "--order",
+        choices=("fixture", "failures"),
+        help="run the test cases in fixture order, or the last failed and then the fastest ones first",
+    )
+    parser.add_argument(
+        "-x",
+        "--fail-fast",
+        action="store_const",
+        const=1,
+        dest="max_failures",
+        help="stop running the test cases of a test after its first failure",
+    )
+    parser.add_argument(
+        "--max-failures",
+        type=int,
+        metavar="N",
+        help="stop running the test cases of a test after N failures",
+    )
+    args = parser.parse_args(argv)
+
+    if args.incremental:
+        os.environ["PYSVT_INCREMENTAL"] = "1"
+    if args.force:
+        os.environ["PYSVT_FORCE"] = "1"
+    if args.update:
+        os.environ["PYSVT_UPDATE"] = "1"
+    if args.order:
+        os.environ["PYSVT_ORDER"] = args.order
+    if args.max_failures:
+        os.environ["PYSVT_MAX_FAILURES"] = str(args.max_failures)
+    if args.keyword:
+        os.environ["PYSVT_KEYWORD"] = args.keyword
+
+    # Tests which do not set `run` explicitly only register themselves while being imported
+    os.environ["PYSVT_RUN"] = "lazy"
+    sys.path.insert(0, os.getcwd())
+
+    modules = discover(args.modules)
+
+    if args.watch:
+        try:
+            _watch(modules)
+        except KeyboardInterrupt:
+            sys.exit(0)
+
+    jobs = args.jobs or os.cpu_count() or 1
+    counts = []
+
+    # Without fork, as on Windows, the modules run one after another
+    if (
+        jobs == 1
+        or len(modules) <= 1
+        or "fork" not in multiprocessing.get_all_start_methods()
+    ):
+        counts = [_run_module(module) for module in modules]
+    else:
+        # Forked workers inherit the environment set above without importing pysvt again
+        context = multiprocessing.get_context("fork")
+
+        with context.Pool(min(jobs, len(modules))) as pool:
+            for output, module_counts in pool.imap_unordered(_run_captured, modules):
+                sys.stdout.write(output)
+                sys.stdout.flush()
+                counts.append(module_counts)
+
+    failures = _summarize(counts, len(modules))
+    sys.exit(1 if failures else 0)
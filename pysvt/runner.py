@@ -0,0 +1,1724 @@
+import asyncio
+import inspect
+import json
+import os
+import random
+import tomllib as toml
+from contextlib import nullcontext
+from dataclasses import replace
+from functools import partial, wraps
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator
+
+from rich.console import Console
+from rich.text import Text
+
+from pysvt.utils.baseline import BaselineStore, is_regression
+from pysvt.utils.batch import compare, split, stack
+from pysvt.utils.benchmark import benchmark
+from pysvt.utils.cache import fixture_cache
+from pysvt.utils.compare import COMPARATORS, mismatch
+from pysvt.utils.complexity import DEFAULT_SIZES, exceeds, fit, normalize
+from pysvt.utils.ctx import Timer, capture_stdout
+from pysvt.utils.discovery import matches
+from pysvt.utils.executor import EXECUTORS, run_async_cases, run_cases
+from pysvt.utils.generate import from_spec, generate_inputs, shrink
+from pysvt.utils.history import HistoryStore
+from pysvt.utils.incremental import ResultStore, fingerprint
+from pysvt.utils.isolation import ISOLATIONS, digest, isolate, snapshot
+from pysvt.utils.limits import run_limited
+from pysvt.utils.memory import trace_memory
+from pysvt.utils.models import Result, _ClsModel, _FixtureModel, _FuncModel
+from pysvt.utils.printer import Printer
+from pysvt.utils.profiling import PROFILE_DIR, PROFILERS, profile, profile_path
+from pysvt.utils.reporters import Reporter
+from pysvt.utils.schema import (
+    ValidationError,
+    case_options,
+    check_inputs,
+    normalize_fixture,
+    resolve_keys,
+)
+from pysvt.utils.snapshot import SnapshotStore, snapshot_key
+from pysvt.utils.validation import get_result_locals
+
+console = Console()
+
+RUN_MODES = ("eager", "lazy")
+OUTPUTS = ("panels", "summary", "quiet")
+ORDERS = ("fixture", "failures")
+PROFILE_MODES = ("all", "failing", "slow")
+REUSE_POLICIES = ("per_case", "per_init", "per_suite")
+
+
+class test:
+    """
+    Decorator class for defining and running test cases.
+
+    Args:
+    - `data` (dict[str, Any]): The test case data as a dictionary. Default is None.
+    - `file` (str or Path): The path to the TOML file (or JSON Lines file with a `.jsonl` suffix, one case per line) containing the test case data. Default is None.
+    - `method` (str or None): The name of the method to be tested (for class-based tests). Default is None.
+    - `preprocess` (Callable[..., Any] or None): A function to preprocess the test inputs. Default is None.
+    - `postprocess` (Callable[..., Any] or None): A function to postprocess the test outputs. Default is None.
+    - `error_only` (bool): Flag indicating whether to display only the failed test cases. Default is False.
+    - `pretty_print_errors` (bool): Flag indicating whether to pretty print errors with colors and more information. Default is True.
+    - `redirect_stdout` (bool): Flag indicating whether to redirect all stdout (print statements, etc) to the pretty printed panels. Default is True.
+    - `show_locals` (bool): Flag indicating whether to show local variable values after execution of the function. Default is False.
+    - `executor` (str): How the test cases are executed - "serial", "thread" (thread pool) or "process" (process pool). Coroutine functions only support "serial", see `concurrency`. Default is "serial".
+    - `workers` (int or None): The maximum number of workers used by the thread or process pool. Default is None (the pool default).
+    - `stream` (bool): Flag indicating whether to load test cases lazily, one at a time, instead of parsing all of them upfront. Default is False.
+    - `cache` (bool): Flag indicating whether to cache the parsed test case file in the `.pysvt_cache` directory and reuse it until the file changes. Ignored when streaming. Default is False.
+    - `run` (str or None): When the test cases are executed - "eager" (when the decorator is applied) or "lazy" (when `run_all` is called). Default is None (the `PYSVT_RUN` environment variable, or "eager" if unset).
+    - `isolation` (str): How the inputs are protected from mutations by the function - "deepcopy", "pickle" (a faster round-trip for plain data), "snapshot" (the inputs are rendered for printing before the call and passed as they are) or "none". Default is "deepcopy".
+    - `detect_mutation` (bool): Flag indicating whether to hash the inputs before and after the call and report mutations. Default is False.
+    - `benchmark` (bool or int): Number of extra timed runs of every test case, or True to calibrate it automatically like `timeit`. Only the function call is timed and the statistics are printed. Default is False.
+    - `warmup` (int): The number of untimed runs before benchmarking a test case. Default is 1.
+    - `baseline` (bool, str or Path or None): The path to the JSON file recording the time taken by every test case, or True to use `<file>.baseline.json` next to the test case file. Test cases without a baseline time are recorded. Default is None.
+    - `update_baseline` (bool): Flag indicating whether to overwrite the baseline times with the current ones. Default is False.
+    - `max_slowdown` (float or None): The maximum allowed ratio of the time taken to the baseline time before a test case fails. Default is None.
+    - `max_slowdown_time` (float or None): The maximum allowed difference in seconds between the time taken and the baseline time before a test case fails. Default is None.
+    - `timeout` (float or None): The maximum time in seconds a test case may run before it is killed and reported as TIMEOUT. Can be set per test case. Default is None.
+    - `max_memory` (int or None): The maximum memory in bytes a test case may allocate before it is reported as OOM. Can be set per test case. Not supported for coroutine functions. Default is None.
+    - `concurrency` (int): The maximum number of test cases of a coroutine function running at the same time on the event loop. Default is 1.
+    - `batch` (bool): Flag indicating whether to call the function once for all test cases, passing one column (a NumPy array if installed, a list otherwise) of values per argument and expecting one output per test case. Default is False.
+    - `reporters` (list[Reporter] or None): Reporters writing the results to files, such as `JsonLinesReporter` or `JUnitXmlReporter`. Default is None.
+    - `output` (str): What is printed to the console - "panels" (a panel per test case and the summary), "summary" (only the summary) or "quiet" (nothing). Default is "panels".
+    - `max_length` (int or None): The maximum number of characters shown for every input, output, stdout and local variable value in the panels, or None for no limit. Default is 1000.
+    - `incremental` (bool or None): Flag indicating whether to skip the test cases which passed in a previous run, as long as neither the test case data nor the code of the function (or class) and the functions it calls changed. The results are recorded in `.pysvt_cache/results.json`. Setting the `PYSVT_FORCE` environment variable runs every test case anyway. Default is None (the `PYSVT_INCREMENTAL` environment variable, or False if unset).
+    - `order` (str or None): The order in which the test cases are executed - "fixture" (as written) or "failures" (the test cases which failed in their last run first, then the fastest ones, using the history recorded in `.pysvt_cache/history.json`). Ignored when streaming. Default is None (the `PYSVT_ORDER` environment variable, or "fixture" if unset).
+    - `fail_fast` (bool): Flag indicating whether to stop executing test cases after the first failure. Same as `max_failures=1`. Default is False.
+    - `max_failures` (int or None): The number of failed test cases after which the remaining test cases are skipped. Default is None (the `PYSVT_MAX_FAILURES` environment variable, or no limit if unset).
+    - `generate` (bool or Callable[[random.Random], list[Any]]): A function returning the inputs of a random test case, or True to generate them from the spec given as the inputs in `file` or `data` (see `pysvt.utils.generate.from_spec`, with optional `examples` and `seed` keys overriding the arguments). Test cases are generated and executed one at a time. Default is False.
+    - `reference` (Callable[..., Any] or None): The reference implementation computing the expected output of the generated test cases. Default is None.
+    - `examples` (int): The number of generated test cases. Default is 100.
+    - `seed` (int): The seed of the generated test cases, which are the same for the same seed. Default is 0.
+    - `shrink` (bool): Flag indicating whether to simplify the inputs of failing generated test cases while they keep failing, reporting the simplest ones. Default is True.
+    - `complexity` (bool or str): Flag indicating whether to fit the time and memory complexity of the function instead of validating it, or the bound (such as "O(n log n)") which the fitted time complexity may not exceed. The function is timed like with `benchmark` and its peak memory is traced with `tracemalloc`, for every input size. Default is False.
+    - `sized_inputs` (Callable[[int], list[Any]] or None): A function returning the inputs of the given size for the complexity analysis. Default is None (the test cases of `file` or `data`).
+    - `sizes` (list[int] or None): The input sizes passed to `sized_inputs`. Default is None (powers of two from 16 to 4096).
+    - `size` (Callable[..., int] or None): A function returning the input size of the inputs of a test case for the complexity analysis. Default is None (the length of the first input).
+    - `profile_memory` (bool): Flag indicating whether to trace the memory allocated by every test case with `tracemalloc` and show its peak and net retained memory. Tracing slows allocations down, which shows in the time taken. Default is False.
+    - `max_peak_memory` (int or None): The maximum peak memory in bytes a test case may allocate before it fails, which enables memory profiling. Can be set per test case. Default is None.
+    - `profile` (bool or str): Which test cases are run once more under a profiler after being validated - "all" (or True), "failing" or "slow" (taking at least `profile_slow` seconds). Test cases setting `profile = true` are always profiled, unlike those stopped by `timeout` or `max_memory`. The hottest functions are shown in the panel. Default is False.
+    - `profiler` (str): The profiler used - "cprofile" (writes `<case>.pstats`) or "sampling" (samples the call stack and writes `<case>.folded` collapsed stacks for flame graphs). Default is "cprofile".
+    - `profile_dir` (str or Path): The directory holding the profiles, in a subdirectory per test. Default is `.pysvt_profiles`.
+    - `profile_top` (int): The number of hottest functions shown in the panel. Default is 10.
+    - `profile_slow` (float): The time in seconds from which a test case is considered slow. Default is 0.1.
+    - `compare` (str or Callable[[Any, Any], bool] or None): How the output is compared with the expected output - "exact", "approx" (numbers within `rel_tol` and `abs_tol`), "unordered" (the same items in any order) or "digest" (the expected output is the digest of the output, see `pysvt.utils.compare.output_digest`), or a function returning whether the output (first argument) matches the expected output. Can be set per test case. Default is None ("approx" if a tolerance is given, "exact" otherwise).
+    - `rel_tol` (float or None): The relative tolerance of the "approx" comparator. Can be set per test case. Default is None (1e-9).
+    - `abs_tol` (float or None): The absolute tolerance of the "approx" comparator. Can be set per test case. Default is None (0.0).
+    - `snapshots` (bool, str or Path or None): The directory holding the outputs of the test cases whose expected output is a snapshot reference (`{ snapshot = "<key>" }`), or True to use `<file>.snapshots` next to the test case file. Missing snapshots are recorded from the actual output. Default is None.
+    - `update_snapshots` (bool or None): Flag indicating whether to overwrite the snapshots with the actual outputs. Default is None (the `PYSVT_UPDATE` environment variable, or False if unset).
+    - `reuse_instance` (str): When a new instance is constructed for class-based tests - "per_case" (for every test case), "per_init" (once per distinct `init` arguments) or "per_suite" (once, with the `init` arguments of the first test case). Reused instances are only supported with the serial executor and without concurrency, `timeout`, `max_memory`, `benchmark`, `complexity` or `profile` (also per test case), which run the test cases in other threads or processes or run them again. Default is "per_case".
+    - `reset` (str or Callable[[Any], Any] or None): The name of a method, or a function taking the instance, called on a reused instance before every test case but the first one. Default is None.
+    - `keyword` (str or None): Only execute the test cases whose name or metadata matches this pattern, unless the qualified name of the function (or method) matches it - a glob if it contains wildcards, a substring otherwise, ignoring case. Nothing is printed if no test case matches. Default is None (the `PYSVT_KEYWORD` environment variable, or every test case if unset).
+
+    Test cases of class-based tests can call several methods in a sequence on the same instance by giving their names as `methods` (such as `methods = ["push", "push", "pop"]`) and one list of arguments per call as the inputs. The output is the list of the return values of the calls.
+
+    Test cases with a timeout or memory limit run in a forked process, so their results must be picklable.
+    Coroutine functions (`async def`) are awaited on an event loop instead, where timeouts are enforced with `asyncio.wait_for`
+    and memory limits, `show_locals`, `benchmark` and `executor` are not supported.
+
+    Raises:
+    - `ValueError`: If the `file` argument is not of type str or Path, `reference` is missing when generating test cases, `complexity` is unknown, `baseline` or `snapshots` is True without a `file`, `method` argument is not provided for instance methods or `executor`, `run`, `isolation`, `output`, `order`, `profile`, `profiler`, `compare` or `reuse_instance` is unknown, or `reuse_instance` is combined with an unsupported argument.
+    - `ValidationError`: If the decorator is applied incorrectly or the test case data is invalid.
+
+    Usage:
+    ```
+    @test(file="data.toml")
+    def function(arg1, arg2):
+        # Your code
+
+    @test(file="data.toml", method="method")
+    class Demo:
+        def method(self, arg1, arg2):
+            # Your code
+
+    data = {
+        "i": [[1, 2], [2, 3]],
+        "o": [2, 3],
+    }
+    @test(data=data)
+    def function(arg1, arg2):
+        # Your code
+    ```
+    """
+
+    def __init__(
+        self,
+        data: dict[str, Any] | None = None,
+        file: str | Path | None = None,
+        method: str | None = None,
+        preprocess: Callable[..., Any] | None = None,
+        postprocess: Callable[..., Any] | None = None,
+        error_only: bool = False,
+        pretty_print_errors: bool = True,
+        redirect_stdout: bool = True,
+        show_locals: bool = False,
+        executor: str = "serial",
+        workers: int | None = None,
+        stream: bool = False,
+        cache: bool = False,
+        run: str | None = None,
+        isolation: str = "deepcopy",
+        detect_mutation: bool = False,
+        benchmark: bool | int = False,
+        warmup: int = 1,
+        baseline: bool | str | Path | None = None,
+        update_baseline: bool = False,
+        max_slowdown: float | None = None,
+        max_slowdown_time: float | None = None,
+        timeout: float | None = None,
+        max_memory: int | None = None,
+        concurrency: int = 1,
+        batch: bool = False,
+        reporters: list[Reporter] | None = None,
+        output: str = "panels",
+        max_length: int | None = 1000,
+        incremental: bool | None = None,
+        order: str | None = None,
+        fail_fast: bool = False,
+        max_failures: int | None = None,
+        generate: bool | Callable[[random.Random], list[Any]] = False,
+        reference: Callable[..., Any] | None = None,
+        examples: int = 100,
+        seed: int = 0,
+        shrink: bool = True,
+        complexity: bool | str = False,
+        sized_inputs: Callable[[int], list[Any]] | None = None,
+        sizes: list[int] | None = None,
+        size: Callable[..., int] | None = None,
+        profile_memory: bool = False,
+        max_peak_memory: int | None = None,
+        profile: bool | str = False,
+        profiler: str = "cprofile",
+        profile_dir: str | Path = PROFILE_DIR,
+        profile_top: int = 10,
+        profile_slow: float = 0.1,
+        compare: str | Callable[[Any, Any], bool] | None = None,
+        rel_tol: float | None = None,
+        abs_tol: float | None = None,
+        snapshots: bool | str | Path | None = None,
+        update_snapshots: bool | None = None,
+        reuse_instance: str = "per_case",
+        reset: str | Callable[[Any], Any] | None = None,
+        keyword: str | None = None,
+    ) -> None:
+        if callable(generate) or sized_inputs is not None:
+            if file is not None or data is not None:
+                raise ValueError(
+                    "File or data argument should not be filled with a generator"
+                )
+        elif (file is None and data is None) or (file is not None and data is not None):
+            raise ValueError("Either of file or data argument should be filled")
+
+        if generate and reference is None:
+            raise ValueError(
+                "Reference function should be given to generate test cases"
+            )
+
+        if file is not None:
+            if not (isinstance(file, Path) or isinstance(file, str)):
+                raise ValueError("File type should be either str or Path")
+
+            self._raw = file if isinstance(file, Path) else Path(file)
+
+        if data is not None:
+            self._raw = data
+
+        self._method = method
+        self._preprocess = preprocess
+        self._postprocess = postprocess
+        self._show_error_only = error_only
+        self._pretty_print_errors = pretty_print_errors
+        self._redirect_stdout = redirect_stdout
+        self._show_locals = show_locals
+
+        if executor not in EXECUTORS:
+            raise ValueError(f"Executor should be one of {', '.join(EXECUTORS)}")
+
+        self._executor = executor
+        self._workers = workers
+        self._stream = stream
+        self._cache = cache
+
+        run = run or os.environ.get("PYSVT_RUN", "eager")
+        if run not in RUN_MODES:
+            raise ValueError(f"Run mode should be one of {', '.join(RUN_MODES)}")
+
+        self._run_mode = run
+
+        if isolation not in ISOLATIONS:
+            raise ValueError(f"Isolation should be one of {', '.join(ISOLATIONS)}")
+
+        self._isolation = isolation
+        self._detect_mutation = detect_mutation
+        self._benchmark = benchmark
+        self._warmup = warmup
+
+        if baseline is True:
+            if not isinstance(self._raw, Path):
+                raise ValueError("Baseline path should be given when using data")
+            baseline = self._raw.with_suffix(".baseline.json")
+
+        self._baseline = Path(baseline) if baseline else None
+        self._update_baseline = update_baseline
+        self._max_slowdown = max_slowdown
+        self._max_slowdown_time = max_slowdown_time
+        self._timeout = timeout
+        self._max_memory = max_memory
+        self._concurrency = concurrency
+        self._batch = batch
+        self._reporters = reporters or []
+
+        if output not in OUTPUTS:
+            raise ValueError(f"Output should be one of {', '.join(OUTPUTS)}")
+
+        self._output = output
+
+        self._printer = Printer(console, max_length)
+
+        if incremental is None:
+            incremental = bool(os.environ.get("PYSVT_INCREMENTAL"))
+
+        self._incremental = incremental
+        self._skipped = 0
+        # Set once `max_failures` is reached, when the remaining test cases are only skipped
+        self._stopping = False
+
+        order = order or os.environ.get("PYSVT_ORDER", "fixture")
+        if order not in ORDERS:
+            raise ValueError(f"Order should be one of {', '.join(ORDERS)}")
+
+        self._order = order
+
+        if fail_fast:
+            max_failures = 1
+        elif max_failures is None and os.environ.get("PYSVT_MAX_FAILURES"):
+            max_failures = int(os.environ["PYSVT_MAX_FAILURES"])
+
+        self._max_failures = max_failures
+        self._generate = generate
+        self._reference = reference
+        self._examples = examples
+        self._seed = seed
+        self._shrink = shrink
+
+        if sized_inputs is not None and not complexity:
+            raise ValueError("Sized inputs are only used for complexity analysis")
+
+        self._complexity = (
+            normalize(complexity) if isinstance(complexity, str) else complexity
+        )
+        self._sized_inputs = sized_inputs
+        self._sizes = DEFAULT_SIZES if sizes is None else sizes
+        self._size = size
+
+        if profile is True:
+            profile = "all"
+        if profile and profile not in PROFILE_MODES:
+            raise ValueError(f"Profile should be one of {', '.join(PROFILE_MODES)}")
+        if profiler not in PROFILERS:
+            raise ValueError(f"Profiler should be one of {', '.join(PROFILERS)}")
+
+        self._profile = profile
+        self._profiler = profiler
+        self._profile_dir = Path(profile_dir)
+        self._profile_top = profile_top
+        self._profile_slow = profile_slow
+        self._profile_memory = profile_memory
+        self._max_peak_memory = max_peak_memory
+
+        if isinstance(compare, str) and compare not in COMPARATORS:
+            raise ValueError(f"Compare should be one of {', '.join(COMPARATORS)}")
+
+        self._compare = compare
+        self._rel_tol = rel_tol
+        self._abs_tol = abs_tol
+
+        if snapshots is True:
+            if not isinstance(self._raw, Path):
+                raise ValueError("Snapshots path should be given when using data")
+            snapshots = self._raw.with_suffix(".snapshots")
+
+        if update_snapshots is None:
+            update_snapshots = bool(os.environ.get("PYSVT_UPDATE"))
+
+        self._snapshots = SnapshotStore(Path(snapshots)) if snapshots else None
+        self._update_snapshots = update_snapshots
+
+        if reuse_instance not in REUSE_POLICIES:
+            raise ValueError(
+                f"Reuse instance should be one of {', '.join(REUSE_POLICIES)}"
+            )
+        # Other threads would share the instance, and processes (of the executor, the limits or the profiler) or
+        # extra runs of the benchmarks would use or change a copy of it
+        if reuse_instance != "per_case" and (
+            executor != "serial"
+            or concurrency > 1
+            or timeout is not None
+            or max_memory is not None
+            or benchmark
+            or complexity
+            or profile
+        ):
+            raise ValueError(
+                "Reused instances are not supported with the thread or process executor, concurrency, timeout, "
+                "max_memory, benchmark, complexity or profile"
+            )
+
+        self._reuse_instance = reuse_instance
+        self._reset = reset
+        self._instances: dict[bytes | str, Any] = {}
+        self._keyword = keyword or os.environ.get("PYSVT_KEYWORD") or None
+
+        if (profile_memory or max_peak_memory is not None) and executor == "thread":
+            raise ValueError(
+                "Memory profiling is not supported with the thread executor"
+            )
+
+        self._data: _ClsModel | list[_FuncModel] | None = None
+        self._cls: type | None = None
+        self._func: Callable[..., Any] | None = None
+        self._is_async = False
+        self._display_obj: Callable[..., Any] | None = None
+        self._qualname = ""
+        self._module = ""
+
+    def __call__(self, obj: object) -> Any:
+        if inspect.isclass(obj):
+            if self._method is None:
+                raise ValueError("method argument not provided")
+
+            method = getattr(obj, self._method, None)
+
+            if "self" not in method.__code__.co_varnames:
+                raise ValidationError(
+                    "The decorator cannot be applied to non-instance methods. Instead, use it directly on the function"
+                )
+
+            self._cls = obj
+            self._func = method
+            self._qualname = f"{obj.__module__}.{obj.__qualname__}.{self._method}"
+            # Binding a placeholder drops `self` from the argspec shown in the panels
+            self._display_obj = partial(method, None)
+        else:
+            if "self" in obj.__code__.co_varnames:
+                raise ValidationError(
+                    "The decorator cannot be applied to instance methods. Instead, apply it on the class and pass the name of the method as an argument"
+                )
+
+            self._func = obj
+            self._qualname = f"{obj.__module__}.{obj.__qualname__}"
+            self._display_obj = obj
+
+        self._module = obj.__module__
+        self._is_async = inspect.iscoroutinefunction(self._func)
+
+        if self._is_async and (self._show_locals or self._benchmark):
+            raise ValueError(
+                "show_locals and benchmark are not supported for coroutine functions"
+            )
+
+        # Coroutine functions run concurrently on the event loop instead
+        if self._is_async and self._executor != "serial":
+            raise ValueError(
+                "The thread and process executors are not supported for coroutine functions"
+            )
+
+        if self._is_async and self._max_memory is not None:
+            raise ValueError("Memory limits are not supported for coroutine functions")
+
+        if (self._profile_memory or self._max_peak_memory is not None) and (
+            self._is_async or self._batch
+        ):
+            raise ValueError(
+                "Memory profiling is not supported with coroutine functions or batch"
+            )
+
+        if self._profile and (self._is_async or self._batch):
+            raise ValueError(
+                "profile is not supported with coroutine functions or batch"
+            )
+
+        if self._complexity and (self._is_async or self._batch):
+            raise ValueError(
+                "complexity is not supported with coroutine functions or batch"
+            )
+
+        if self._batch and (
+            self._is_async
+            or self._show_locals
+            or self._benchmark
+            or self._timeout is not None
+            or self._max_memory is not None
+            or self._snapshots is not None
+        ):
+            raise ValueError(
+                "batch is not supported with coroutine functions, show_locals, benchmark, timeout, max_memory or snapshots"
+            )
+
+        if self._run_mode == "lazy":
+            registry.append(self)
+        else:
+            self.run()
+
+        @wraps(obj)
+        def wrapper(*args, **kwargs):
+            return obj(*args, **kwargs)
+
+        return wrapper
+
+    def run(self) -> tuple[int, int]:
+        """
+        Loads and validates all the test cases of the decorated function or class and prints the results.
+
+        This is called by the decorator itself unless the test is lazy, in which case it is called by `run_all`.
+
+        Returns:
+        - tuple[int, int]: The total number of test cases and the number of failed test cases.
+
+        Raises:
+        - `ValidationError`: If the test case data is invalid.
+        """
+        if self._complexity:
+            return self._run_complexity()
+
+        is_class = self._cls is not None
+
+        if self._generate:
+            cases = self._iter_generated()
+        elif self._stream:
+            cases = self._iter_cases(self._load_data())
+        else:
+            self._data = _ClsModel([], []) if is_class else []
+            self._parse(self._load_fixture(), is_class)
+
+            if is_class:
+                cases = zip(self._data.init, self._data.data)
+            else:
+                cases = (([], data) for data in self._data)
+
+        if self._keyword is not None and not matches(self._keyword, self._qualname):
+            cases = self._select(cases)
+
+        history = None if self._order == "fixture" else HistoryStore()
+        if history is not None and not self._stream and not self._generate:
+            cases = sorted(
+                cases,
+                key=lambda case: history.priority(
+                    self._qualname, Text.from_markup(case[1].name).plain
+                ),
+            )
+
+        total = 0
+        failures = 0
+        benchmarks = []
+        regressions = []
+        memory = []
+        store = None if self._baseline is None else BaselineStore(self._baseline)
+        self._instances = {}
+        results_store = None
+        keys: dict[int, str] = {}
+        self._skipped = 0
+        self._stopping = False
+
+        if self._incremental:
+            results_store = ResultStore()
+            passed = results_store.passed(
+                self._qualname,
+                fingerprint(
+                    self._cls or self._func,
+                    self._preprocess,
+                    self._postprocess,
+                    self._compare if callable(self._compare) else None,
+                    self._reset if callable(self._reset) else None,
+                ),
+            )
+            cases = self._skip_passed(cases, passed, keys)
+
+        # Reporters learn about the test cases skipped while pulling them
+        for reporter in self._reporters:
+            reporter.start(self._qualname)
+
+        # The test cases pulled by the executor but not reported yet, to know which are skipped when stopping early
+        in_flight: dict[int, _FuncModel] = {}
+        cases = iter(cases)
+
+        def pull() -> Iterator[tuple[list[Any], _FuncModel]]:
+            for case in cases:
+                in_flight[id(case[1])] = case[1]
+                yield case
+
+        if self._batch:
+            results = self._run_batch(pull())
+        elif self._is_async:
+            results = run_async_cases(self._run_case_async, pull(), self._concurrency)
+        else:
+            # Failing generated test cases are shrunk first, so only the tracebacks of the shrunk ones are printed
+            run_case = partial(
+                self._run_case, quiet=bool(self._generate and self._shrink)
+            )
+            results = run_cases(run_case, pull(), self._executor, self._workers)
+
+        for (init, data), (result, time_taken) in results:
+            in_flight.pop(id(data), None)
+
+            if self._generate and self._shrink and not result.valid:
+                data, result, time_taken = self._shrink_case(
+                    init, data, result, time_taken
+                )
+
+                if result.status == "ERROR":
+                    # Run again only to print the traceback of the simplest failing test case
+                    self._run_case((init, data))
+
+            # Test cases stopped by their limits would run again without them
+            if result.status not in ("TIMEOUT", "OOM") and data.options.get(
+                "profile", self._should_profile(result, time_taken)
+            ):
+                result = self._profile_case(init, data, result)
+
+            if store is not None:
+                result = self._compare_baseline(store, data, result, time_taken)
+
+                if result.regressed:
+                    regressions.append((data.name, result.baseline, result.time))
+
+            total += 1
+            failures += 0 if result.valid else 1
+
+            if result.stats is not None:
+                benchmarks.append((data.name, result.stats))
+
+            if result.peak_memory is not None:
+                memory.append((data.name, result.peak_memory, result.net_memory))
+
+            if self._output == "panels":
+                self._printer.post_validation(
+                    result, data, self._display_obj, time_taken, self._show_error_only
+                )
+
+            for reporter in self._reporters:
+                reporter.report(self._qualname, result, data, time_taken)
+
+            key = keys.pop(id(data), None)
+            if key is not None:
+                results_store.set(self._qualname, key, result.valid)
+
+            if history is not None:
+                history.set(
+                    self._qualname,
+                    Text.from_markup(data.name).plain,
+                    not result.valid,
+                    time_taken,
+                )
+
+            if self._max_failures is not None and failures >= self._max_failures:
+                # Stops the executor, then skips what it pulled but did not report and what is left, which is
+                # pulled without preprocessing the inputs or computing the expected outputs
+                results.close()
+                for skipped in in_flight.values():
+                    self._skip(skipped)
+
+                self._stopping = True
+                for _, skipped in cases:
+                    self._skip(skipped)
+                break
+
+        # Reused instances may hold large resources which are not needed anymore
+        self._instances = {}
+
+        if store is not None:
+            store.save()
+
+        if results_store is not None:
+            results_store.save()
+
+        if history is not None:
+            history.save()
+
+        for reporter in self._reporters:
+            reporter.finish(self._qualname, total, failures)
+
+        # Tests deselected by the keyword stay silent
+        selected = self._keyword is None or total or self._skipped
+        if self._output != "quiet" and selected:
+            self._printer.finish(
+                total, failures, benchmarks, regressions, self._skipped, memory
+            )
+
+        return total, failures
+
+    def _run_complexity(self) -> tuple[int, int]:
+        """
+        Times the function and traces its peak memory for every input size, and fits their complexity.
+
+        Returns:
+        - tuple[int, int]: One test case, and whether it failed because the time complexity exceeds the bound.
+
+        Raises:
+        - `ValidationError`: If the test case data is invalid or has fewer than three distinct positive input sizes.
+        """
+        if self._sized_inputs is not None:
+            sizes = list(self._sizes)
+            cases = [
+                ([], _FuncModel(self._sized_inputs(n), None, f"Size {n}", ""))
+                for n in sizes
+            ]
+        else:
+            is_class = self._cls is not None
+            self._data = _ClsModel([], []) if is_class else []
+            self._parse(self._load_fixture(), is_class)
+
+            if is_class:
+                cases = list(zip(self._data.init, self._data.data))
+            else:
+                cases = [([], data) for data in self._data]
+
+            size = self._size or (lambda *inputs: len(inputs[0]))
+            sizes = [size(*(data.inputs or [])) for _, data in cases]
+
+        if len(set(sizes)) < 3 or min(sizes) < 1:
+            raise ValidationError(
+                "At least three distinct positive input sizes are needed to fit the complexity"
+            )
+
+        repeats = None if isinstance(self._benchmark, bool) else self._benchmark
+        times = []
+        peaks = []
+
+        for init, data in cases:
+            prepare = partial(self._prepare_call, init, data)
+            times.append(benchmark(prepare, repeats, self._warmup).min)
+
+            with capture_stdout():
+                _, peak, _ = trace_memory(prepare())
+            peaks.append(peak)
+
+        time_complexity = fit(sizes, times)
+        memory_complexity = fit(sizes, [float(peak) for peak in peaks])
+        bound = self._complexity if isinstance(self._complexity, str) else None
+        failed = bound is not None and exceeds(time_complexity, bound)
+
+        if self._output != "quiet":
+            self._printer.complexity(
+                sizes, times, peaks, time_complexity, memory_complexity, bound
+            )
+            self._printer.finish(1, int(failed))
+
+        return 1, int(failed)
+
+    def _should_profile(self, result: Result, time_taken: float) -> bool:
+        """
+        Returns whether the test case should be profiled according to the `profile` argument.
+        """
+        if self._profile == "all":
+            return True
+        if self._profile == "failing":
+            return not result.valid
+        if self._profile == "slow":
+            return time_taken >= self._profile_slow
+        return False
+
+    def _profile_case(
+        self, init: list[Any], data: _FuncModel, result: Result
+    ) -> Result:
+        """
+        Runs the test case once more under the profiler, writing its profile to the profile directory.
+
+        Args:
+        - `init` (list[Any]): The constructor arguments (ignored for functions).
+        - `data` (_FuncModel): The test case data.
+        - `result` (Result): The validation result.
+
+        Returns:
+        - Result: The validation result with the hottest functions and the path of the profile.
+        """
+        path = profile_path(
+            self._profile_dir, self._qualname, Text.from_markup(data.name).plain
+        )
+
+        with capture_stdout():
+            hotspots = profile(
+                self._prepare_call(init, data), self._profiler, path, self._profile_top
+            )
+
+        suffix = ".pstats" if self._profiler == "cprofile" else ".folded"
+        return replace(result, hotspots=hotspots, profile=str(path.with_suffix(suffix)))
+
+    def _iter_generated(self) -> Iterator[tuple[list[Any], _FuncModel]]:
+        """
+        Lazily yields the constructor arguments and `_FuncModel` of every generated test case, with the output
+        of the reference function as the expected output.
+
+        Yields:
+        - tuple[list[Any], _FuncModel]: The constructor arguments (none) and the test case data.
+
+        Raises:
+        - `ValidationError`: If no input spec is given in the test case data.
+        """
+        generator = self._generate
+        examples = self._examples
+        seed = self._seed
+
+        if generator is True:
+            data = self._load_data()
+            input_key, _ = resolve_keys(data)
+
+            if input_key is None:
+                raise ValidationError("No input spec given or input key is invalid")
+
+            generator = from_spec(data[input_key])
+            examples = data.get("examples", examples)
+            seed = data.get("seed", seed)
+
+        index = 0
+        for index, inputs in enumerate(generate_inputs(generator, examples, seed)):
+            if self._stopping:
+                break
+
+            data = self._make_model(
+                index, inputs, None, f"Seed {seed}", "Generated case", {}
+            )
+            yield [], replace(data, output=self._expect(data.inputs))
+        else:
+            return
+
+        # The remaining test cases are only skipped, which needs neither their inputs nor their outputs
+        for index in range(index, examples):
+            yield [], self._make_model(
+                index, None, None, f"Seed {seed}", "Generated case", {}
+            )
+
+    def _expect(self, inputs: list[Any]) -> Any:
+        """
+        Returns the output of the reference function, which is given a copy of the inputs.
+        """
+        return self._reference(*isolate(inputs, "deepcopy"))
+
+    def _shrink_case(
+        self, init: list[Any], data: _FuncModel, result: Result, time_taken: float
+    ) -> tuple[_FuncModel, Result, float]:
+        """
+        Simplifies the inputs of a failing generated test case while it keeps failing.
+
+        Args:
+        - `init` (list[Any]): The constructor arguments.
+        - `data` (_FuncModel): The failing test case data.
+        - `result` (Result): The validation result of the failing test case.
+        - `time_taken` (float): The time taken for the validation.
+
+        Returns:
+        - tuple[_FuncModel, Result, float]: The simplest failing test case data, its validation result and the time taken.
+        """
+        last = data, result, time_taken
+
+        def fails(inputs: list[Any]) -> bool:
+            nonlocal last
+
+            try:
+                trial = replace(data, inputs=inputs, output=self._expect(inputs))
+            except Exception:  # Not a valid input for the reference function
+                return False
+
+            trial_result, trial_time = self._run_case((init, trial), quiet=True)
+            if trial_result.valid:
+                return False
+
+            last = (
+                replace(trial, name=f"{data.name} (shrunk)"),
+                trial_result,
+                trial_time,
+            )
+            return True
+
+        shrink(data.inputs, fails)
+        return last
+
+    def _select(
+        self, cases: Iterable[tuple[list[Any], _FuncModel]]
+    ) -> Iterator[tuple[list[Any], _FuncModel]]:
+        """
+        Lazily filters out the test cases whose name and metadata do not match the keyword.
+        """
+        for init, data in cases:
+            if matches(self._keyword, Text.from_markup(data.name).plain, data.metadata):
+                yield init, data
+
+    def _skip_passed(
+        self,
+        cases: Iterable[tuple[list[Any], _FuncModel]],
+        passed: set[str],
+        keys: dict[int, str],
+    ) -> Iterator[tuple[list[Any], _FuncModel]]:
+        """
+        Lazily filters out the test cases which passed in a previous run, counting them in `_skipped`.
+
+        Args:
+        - `cases` (Iterable[tuple[list[Any], _FuncModel]]): The constructor arguments and the test case data.
+        - `passed` (set[str]): The keys of the test cases which passed with the current fingerprint.
+        - `keys` (dict[int, str]): Filled with the key of every yielded test case, by the id of its data.
+
+        Returns:
+        - Iterator[tuple[list[Any], _FuncModel]]: The test cases to execute.
+        """
+        force = bool(os.environ.get("PYSVT_FORCE"))
+        # A passed test case may fail with a stricter comparison
+        comparison = [
+            None if callable(self._compare) else self._compare,
+            self._rel_tol,
+            self._abs_tol,
+        ]
+
+        for init, data in cases:
+            try:
+                key = digest(
+                    [init, data.inputs, data.output, data.options, comparison]
+                ).hex()
+            except Exception:  # Unpicklable test cases always run
+                yield init, data
+                continue
+
+            if key in passed and not force:
+                self._skip(data)
+                continue
+
+            keys[id(data)] = key
+            yield init, data
+
+    def _skip(self, data: _FuncModel) -> None:
+        """
+        Counts a test case as skipped and reports it.
+        """
+        self._skipped += 1
+
+        for reporter in self._reporters:
+            reporter.skip(self._qualname, data)
+
+    def _compare_baseline(
+        self, store: BaselineStore, data: _FuncModel, result: Result, time_taken: float
+    ) -> Result:
+        """
+        Compares the time taken by a test case with its baseline, recording it if there is none yet.
+
+        The benchmark median is used instead of the single measurement when available.
+
+        Args:
+        - `store` (BaselineStore): The baseline store.
+        - `data` (_FuncModel): The test case data.
+        - `result` (Result): The validation result.
+        - `time_taken` (float): The time taken for the validation.
+
+        Returns:
+        - Result: The validation result, marked as failed if the test case is slower than allowed.
+        """
+        seconds = time_taken if result.stats is None else result.stats.median
+        case = Text.from_markup(data.name).plain
+        baseline = store.get(self._qualname, case)
+
+        if baseline is None or self._update_baseline:
+            store.set(self._qualname, case, seconds)
+            return result
+
+        regressed = is_regression(
+            seconds, baseline, self._max_slowdown, self._max_slowdown_time
+        )
+
+        return replace(
+            result,
+            valid=result.valid and not regressed,
+            regressed=regressed,
+            baseline=baseline,
+            time=seconds,
+        )
+
+    def _run_case(
+        self, case: tuple[list[Any], _FuncModel], quiet: bool = False
+    ) -> tuple[Result, float]:
+        """
+        Executes a single test case, constructing a fresh instance for class-based tests.
+
+        This is the unit of work handed to the executor.
+
+        Args:
+        - `case` (tuple[list[Any], _FuncModel]): The constructor arguments (ignored for functions) and the test case data.
+        - `quiet` (bool): Flag indicating whether to leave out the traceback of an error. Default is False.
+
+        Returns:
+        - tuple[Result, float]: The validation result and the time taken for the validation.
+
+        Raises:
+        - `ValidationError`: If the test case sets an option which is not supported with reused instances.
+        """
+        init, data = case
+        timeout = data.options.get("timeout", self._timeout)
+        max_memory = data.options.get("max_memory", self._max_memory)
+
+        if self._reuse_instance != "per_case" and (
+            timeout is not None or max_memory is not None or data.options.get("profile")
+        ):
+            raise ValidationError(
+                f"{Text.from_markup(data.name).plain} sets timeout, max_memory or profile, which are not supported with reused instances"
+            )
+
+        if timeout is None and max_memory is None:
+            result, time_taken = self._timed_validate(init, data, quiet)
+        else:
+            with Timer() as timer:
+                status, value = run_limited(
+                    partial(self._timed_validate, init, data, quiet),
+                    timeout,
+                    max_memory,
+                )
+
+            if status == "OK":
+                result, time_taken = value
+            else:
+                result = Result(None, None, False, None, status=status)
+                time_taken = timer()
+
+        if self._benchmark and result.status == "OK":
+            repeats = None if self._benchmark is True else self._benchmark
+            stats = benchmark(
+                partial(self._prepare_call, init, data), repeats, self._warmup
+            )
+            result = replace(result, stats=stats)
+
+        return result, time_taken
+
+    def _run_batch(
+        self, cases: Iterable[tuple[list[Any], _FuncModel]]
+    ) -> Iterator[tuple[tuple[list[Any], _FuncModel], tuple[Result, float]]]:
+        """
+        Executes all the test cases with a single call of the function, passing one column of values per argument.
+
+        The function must return one output per test case. The time taken by the call is split evenly between
+        the test cases and the stdout is attached to the first one.
+
+        Args:
+        - `cases` (Iterable[tuple[list[Any], _FuncModel]]): The constructor arguments and the data of every test case.
+
+        Yields:
+        - tuple: Each test case along with its validation result and time taken, like `run_cases`.
+
+        Raises:
+        - `ValidationError`: If the test cases of a class-based test do not share the same constructor arguments.
+        """
+        cases = list(cases)
+        if not cases:
+            return
+
+        init = cases[0][0]
+        if any(case_init != init for case_init, _ in cases):
+            raise ValidationError(
+                "All test cases should have the same init arguments in batch mode"
+            )
+
+        inputs = [self._prepare_inputs(data)[0] for _, data in cases]
+        func = self._bind(init)
+        stdout = None
+        status = "OK"
+
+        with Timer() as timer:
+            try:
+                columns = stack(inputs)
+                with capture_stdout() if self._redirect_stdout else nullcontext() as f:
+                    outputs = split(func(*columns), len(cases))
+                stdout = None if f is None else f.getvalue()
+            except Exception as e:
+                if not self._pretty_print_errors:
+                    raise
+
+                console.print_exception(show_locals=True)
+                outputs = [None] * len(cases)
+                status = "OOM" if isinstance(e, MemoryError) else "ERROR"
+
+        if self._postprocess is not None and status == "OK":
+            outputs = [self._postprocess(output) for output in outputs]
+
+        if status != "OK":
+            mismatches = [None] * len(cases)
+            valid = [False] * len(cases)
+        elif self._is_exact([data for _, data in cases]):
+            # A single array comparison, only locating the mismatches of the failed test cases
+            valid = compare(outputs, [data.output for _, data in cases])
+            mismatches = [
+                None if is_valid else mismatch(output, data.output)
+                for (_, data), output, is_valid in zip(cases, outputs, valid)
+            ]
+        else:
+            mismatches = [
+                self._compare_output(data, output)
+                for (_, data), output in zip(cases, outputs)
+            ]
+            valid = [found is None for found in mismatches]
+
+        time_taken = timer() / len(cases)
+
+        for index, (case, output, is_valid, found) in enumerate(
+            zip(cases, outputs, valid, mismatches)
+        ):
+            result = Result(
+                output,
+                stdout if index == 0 else None,
+                is_valid,
+                None,
+                status=status,
+                mismatch=found,
+            )
+            yield case, (result, time_taken)
+
+    async def _run_case_async(
+        self, case: tuple[list[Any], _FuncModel]
+    ) -> tuple[Result, float]:
+        """
+        Executes a single test case of a coroutine function, see `_run_case`.
+
+        Args:
+        - `case` (tuple[list[Any], _FuncModel]): The constructor arguments (ignored for functions) and the test case data.
+
+        Returns:
+        - tuple[Result, float]: The validation result and the time taken for the validation.
+
+        Raises:
+        - `ValueError`: If a memory limit is set.
+        """
+        init, data = case
+
+        if data.options.get("max_memory", self._max_memory) is not None:
+            raise ValueError("Memory limits are not supported for coroutine functions")
+
+        timeout = data.options.get("timeout", self._timeout)
+        func = self._bind(init, data)
+
+        with Timer() as timer:
+            result = await self._validate_async(data, func, timeout)
+
+        return result, timer()
+
+    def _timed_validate(
+        self, init: list[Any], data: _FuncModel, quiet: bool = False
+    ) -> tuple[Result, float]:
+        """
+        Validates a test case, measuring the time taken without constructing the instance, and the memory
+        allocated if memory profiling is enabled.
+
+        Args:
+        - `init` (list[Any]): The constructor arguments (ignored for functions).
+        - `data` (_FuncModel): The test case data.
+        - `quiet` (bool): Flag indicating whether to leave out the traceback of an error. Default is False.
+
+        Returns:
+        - tuple[Result, float]: The validation result and the time taken for the validation.
+        """
+        func = self._bind(init, data)
+        # Isolated before tracing, so that copying the inputs is neither timed nor counted as allocated memory
+        prepared = self._prepare_inputs(data)
+
+        def timed() -> tuple[Result, float]:
+            with Timer() as timer:
+                result = self._validate(data, func, prepared, quiet)
+
+            return result, timer()
+
+        max_peak_memory = data.options.get("max_peak_memory", self._max_peak_memory)
+        if not self._profile_memory and max_peak_memory is None:
+            return timed()
+
+        (result, time_taken), peak, net = trace_memory(timed)
+        exceeded = max_peak_memory is not None and peak > max_peak_memory
+
+        return (
+            replace(
+                result,
+                valid=result.valid and not exceeded,
+                peak_memory=peak,
+                net_memory=net,
+                peak_exceeded=exceeded,
+            ),
+            time_taken,
+        )
+
+    def _bind(
+        self, init: list[Any], data: _FuncModel | None = None
+    ) -> Callable[..., Any]:
+        """
+        Returns the function under test, bound to an instance for class-based tests according to `reuse_instance`.
+
+        Args:
+        - `init` (list[Any]): The constructor arguments (ignored for functions).
+        - `data` (_FuncModel or None): The test case data, which may call a sequence of methods. Default is None.
+
+        Returns:
+        - Callable[..., Any]: The function to call with the test case inputs.
+
+        Raises:
+        - `ValidationError`: If a test case of a function or coroutine function calls a sequence of methods.
+        """
+        methods = None if data is None else data.options.get("methods")
+
+        if self._cls is None:
+            if methods is not None:
+                raise ValidationError(
+                    "Method sequences are only supported for class-based tests"
+                )
+            return self._func
+
+        instance = self._instance(init)
+
+        if methods is None:
+            return partial(self._func, instance)
+
+        if self._is_async:
+            raise ValidationError(
+                "Method sequences are not supported for coroutine functions"
+            )
+
+        def call(*calls: list[Any]) -> list[Any]:
+            return [
+                getattr(instance, method)(*args) for method, args in zip(methods, calls)
+            ]
+
+        return call
+
+    def _instance(self, init: list[Any]) -> Any:
+        """
+        Returns a new instance of the tested class, or a reused one according to `reuse_instance`, calling the
+        reset hook on reused instances.
+
+        Args:
+        - `init` (list[Any]): The constructor arguments.
+
+        Returns:
+        - Any: The instance.
+        """
+        if self._reuse_instance == "per_case":
+            return self._cls(*init)
+
+        if self._reuse_instance == "per_suite":
+            key: bytes | str = ""
+        else:
+            try:
+                key = digest(init)
+            except Exception:  # Unpicklable arguments are told apart by their repr
+                key = repr(init)
+
+        instance = self._instances.get(key)
+
+        if instance is None:
+            instance = self._instances[key] = self._cls(*init)
+        elif isinstance(self._reset, str):
+            getattr(instance, self._reset)()
+        elif self._reset is not None:
+            self._reset(instance)
+
+        return instance
+
+    def _prepare_call(self, init: list[Any], data: _FuncModel) -> Callable[[], Any]:
+        """
+        Builds a call of the function under test with isolated inputs, used for benchmarking.
+
+        Args:
+        - `init` (list[Any]): The constructor arguments (ignored for functions).
+        - `data` (_FuncModel): The test case data.
+
+        Returns:
+        - Callable[[], Any]: The call to time.
+        """
+        inputs = [] if data.inputs is None else data.inputs
+        return partial(self._bind(init, data), *isolate(inputs, self._isolation))
+
+    def _load_data(self) -> dict[str, Any]:
+        """
+        Loads a TOML file and returns its contents as a dictionary.
+
+        JSON Lines files are read lazily and returned as `{"cases": <generator of cases>}`.
+
+        Returns:
+        - dict: The contents of the TOML file.
+
+        Raises:
+        - FileNotFoundError: If the specified file does not exist.
+        - tomllib.TomlDecodeError: If the TOML file is not valid.
+        """
+        if isinstance(self._raw, Path):
+            if self._raw.suffix == ".jsonl":
+                return {"cases": _read_json_lines(open(self._raw, "rb"))}
+
+            with open(self._raw, "rb") as f:
+                return toml.load(f)
+        else:
+            return self._raw
+
+    def _load_fixture(self) -> _FixtureModel:
+        """
+        Loads and normalizes the test case data, going through the fixture cache for files when enabled.
+
+        Returns:
+        - _FixtureModel: The normalized test case data.
+        """
+        if self._cache and isinstance(self._raw, Path):
+            return fixture_cache.load(
+                self._raw, lambda: self._normalize(self._load_data())
+            )
+
+        return self._normalize(self._load_data())
+
+    def _iter_cases(
+        self, data: dict[str, Any]
+    ) -> Iterator[tuple[list[Any], _FuncModel]]:
+        """
+        Lazily yields the constructor arguments and `_FuncModel` of every test case.
+
+        Unlike `_parse`, `[[cases]]` tables (or any iterable of case dictionaries, such as the generator
+        returned for JSON Lines files) are consumed one at a time, so only the current case is held in memory.
+        Cases without an `init` key are constructed without arguments.
+
+        Args:
+        - `data` (dict): The test case data.
+
+        Yields:
+        - tuple[list[Any], _FuncModel]: The constructor arguments and the test case data.
+
+        Raises:
+        - `ValidationError`: If the test case data is invalid.
+        """
+        if "cases" not in data:
+            self._data = _ClsModel([], [])
+            self._parse(self._normalize(data), True)
+            yield from zip(self._data.init, self._data.data)
+            return
+
+        for index, case in enumerate(data["cases"]):
+            input_key, output_key = resolve_keys(case)
+
+            if output_key is None:
+                raise ValidationError(
+                    f"No output data given or output key is invalid in case {index + 1}"
+                )
+
+            data = self._make_model(
+                index,
+                None if input_key is None else case[input_key],
+                case[output_key],
+                case.get("metadata", "No metadata"),
+                case.get("name", "Test case"),
+                case_options(case, index),
+            )
+
+            if input_key is not None and not self._stopping:
+                check_inputs(data.inputs, input_key, index)
+            yield case.get("init", []), data
+
+    def _make_model(
+        self,
+        index: int,
+        inputs: Any,
+        output: Any,
+        metadata: str,
+        name: str,
+        options: dict[str, Any],
+    ) -> _FuncModel:
+        """
+        Creates the `_FuncModel` of a test case, applying the preprocess function to the inputs unless the
+        test case is only skipped after `max_failures` is reached.
+
+        Args:
+        - `index` (int): The index of the test case.
+        - `inputs` (Any): The raw inputs of the test case.
+        - `output` (Any): The expected output of the test case.
+        - `metadata` (str): The metadata of the test case.
+        - `name` (str): The name of the test case.
+        - `options` (dict[str, Any]): The per test case options, see `pysvt.utils.schema.CASE_OPTIONS`.
+
+        Returns:
+        - _FuncModel: The test case data.
+        """
+        return _FuncModel(
+            inputs=(
+                inputs
+                if self._preprocess is None or self._stopping
+                else self._preprocess(inputs)
+            ),
+            output=output,
+            metadata=metadata,
+            name=f"{name} {Printer.number(index + 1)}",
+            options=options,
+        )
+
+    def _normalize(self, data: dict[str, Any]) -> _FixtureModel:
+        """
+        Resolves the keys of the test case data from the TOML file into equally long lists, see `pysvt.utils.schema.normalize_fixture`.
+
+        The result only depends on the data, which makes it suitable for caching.
+
+        Args:
+        - `data` (dict): The test case data loaded from the TOML file.
+
+        Returns:
+        - _FixtureModel: The normalized test case data.
+
+        Raises:
+        - `ValidationError`: If the test case data is invalid.
+        """
+        return normalize_fixture(data)
+
+    def _parse(self, fixture: _FixtureModel, is_class: bool) -> None:
+        """
+        Populates the `_ClsModel` or `_FuncModel` objects from the normalized test case data, in bulk.
+
+        Args:
+        - `fixture` (_FixtureModel): The normalized test case data.
+        - `is_class` (bool): Flag indicating whether the test is class-based or function-based.
+
+        Raises:
+        - `ValidationError`: If the preprocessed inputs of a test case are not a list.
+        """
+        preprocess = self._preprocess or (lambda inputs: inputs)
+        models = [
+            _FuncModel(
+                preprocess(inputs),
+                output,
+                f"{name} {Printer.number(index)}",
+                metadata,
+                options,
+            )
+            for index, (inputs, output, metadata, name, options) in enumerate(
+                zip(
+                    fixture.inputs,
+                    fixture.outputs,
+                    fixture.metadata,
+                    fixture.name,
+                    fixture.options,
+                ),
+                1,
+            )
+        ]
+
+        # Checked once preprocessed, as the preprocess function may turn the raw inputs into a list
+        for index, model in enumerate(models):
+            if model.inputs is not None and type(model.inputs) is not list:
+                check_inputs(model.inputs, fixture.input_key, index)
+
+        if is_class:
+            self._data.init = fixture.init
+            self._data.data.extend(models)
+        else:
+            self._data.extend(models)
+
+    def _validate(
+        self,
+        data: _FuncModel,
+        func: Callable[..., Any],
+        prepared: tuple[list[Any], list[str] | None, bytes | None] | None = None,
+        quiet: bool = False,
+    ) -> Result:
+        """
+        Validates a test case by executing the test function and comparing the result with the expected output.
+
+        Args:
+        - `data` (_FuncModel): The test case data.
+        - `func` (Callable[..., Any]): The test function to be executed.
+        - `prepared` (tuple or None): The inputs already prepared by `_prepare_inputs`, if any. Default is None.
+        - `quiet` (bool): Flag indicating whether to leave out the traceback of an error. Default is False.
+
+        Returns:
+        - Result: The validation result, including the actual result and a flag indicating whether the test passed or failed.
+
+        Raises:
+        - `ValidationError`: If the test case inputs are not of the expected format.
+        """
+        inputs, rendered_inputs, input_digest = prepared or self._prepare_inputs(data)
+        partial_fn = partial(func, *inputs)
+        stdout = None
+        local_vars = None
+        locals_overhead = None
+        status = "OK"
+
+        try:
+            with capture_stdout() if self._redirect_stdout else nullcontext() as f:
+                if self._show_locals:
+                    result, local_vars, locals_overhead = get_result_locals(partial_fn)
+                else:
+                    result = partial_fn()
+            stdout = None if f is None else f.getvalue()
+        except Exception as e:
+            if not self._pretty_print_errors:
+                raise
+
+            if not quiet:
+                console.print_exception(show_locals=True)
+            result = None
+            status = "OOM" if isinstance(e, MemoryError) else "ERROR"
+
+        result = self._make_result(
+            data,
+            inputs,
+            result,
+            stdout,
+            local_vars,
+            rendered_inputs,
+            input_digest,
+            status,
+        )
+
+        if locals_overhead is None:
+            return result
+        return replace(result, locals_overhead=locals_overhead)
+
+    async def _validate_async(
+        self, data: _FuncModel, func: Callable[..., Any], timeout: float | None
+    ) -> Result:
+        """
+        Validates a test case of a coroutine function, see `_validate`.
+
+        Stdout is captured per task, so concurrent test cases do not mix their output.
+
+        Args:
+        - `data` (_FuncModel): The test case data.
+        - `func` (Callable[..., Any]): The coroutine function to be executed.
+        - `timeout` (float or None): The maximum time in seconds to wait for the coroutine.
+
+        Returns:
+        - Result: The validation result.
+
+        Raises:
+        - `ValidationError`: If the test case inputs are not of the expected format.
+        """
+        inputs, rendered_inputs, input_digest = self._prepare_inputs(data)
+        stdout = None
+        status = "OK"
+
+        try:
+            with capture_stdout() if self._redirect_stdout else nullcontext() as f:
+                result = await asyncio.wait_for(func(*inputs), timeout)
+            stdout = None if f is None else f.getvalue()
+        except asyncio.TimeoutError:
+            result = None
+            status = "TIMEOUT"
+        except Exception as e:
+            if not self._pretty_print_errors:
+                raise
+
+            console.print_exception(show_locals=True)
+            result = None
+            status = "OOM" if isinstance(e, MemoryError) else "ERROR"
+
+        return self._make_result(
+            data, inputs, result, stdout, None, rendered_inputs, input_digest, status
+        )
+
+    def _prepare_inputs(
+        self, data: _FuncModel
+    ) -> tuple[list[Any], list[str] | None, bytes | None]:
+        """
+        Isolates the inputs of a test case before they are passed to the function.
+
+        Args:
+        - `data` (_FuncModel): The test case data.
+
+        Returns:
+        - tuple[list[Any], list[str] | None, bytes | None]: The inputs to pass, their rendered snapshot and their digest if enabled.
+
+        Raises:
+        - `ValidationError`: If the test case inputs are not of the expected format.
+        """
+        if data.inputs is None:
+            return [], None, None
+
+        if not isinstance(data.inputs, list):
+            raise ValidationError("Inputs must be nested within a list")
+
+        methods = data.options.get("methods")
+        if methods is not None and len(methods) != len(data.inputs):
+            raise ValidationError(
+                f"Methods and inputs of {Text.from_markup(data.name).plain} are not of the same length ({len(methods)} and {len(data.inputs)})"
+            )
+
+        rendered_inputs = None
+        # Only rendered as far as the panels show them, and not at all without panels
+        if self._isolation == "snapshot" and self._output == "panels":
+            rendered_inputs = snapshot(data.inputs, self._printer.format)
+
+        # Isolate to avoid inconsistent inputs being printed due to mutations
+        inputs = isolate(data.inputs, self._isolation)
+        input_digest = None
+
+        if self._detect_mutation:
+            try:
+                input_digest = digest(inputs)
+            except Exception:  # Unpicklable inputs are not checked for mutations
+                pass
+
+        return inputs, rendered_inputs, input_digest
+
+    def _make_result(
+        self,
+        data: _FuncModel,
+        inputs: list[Any],
+        result: Any,
+        stdout: str | None,
+        local_vars: dict[str, Any] | None,
+        rendered_inputs: list[str] | None,
+        input_digest: bytes | None,
+        status: str,
+    ) -> Result:
+        """
+        Postprocesses the output of the function and compares it with the expected output.
+
+        Args:
+        - `data` (_FuncModel): The test case data.
+        - `inputs` (list[Any]): The inputs passed to the function.
+        - `result` (Any): The output of the function.
+        - `stdout` (str or None): The captured stdout.
+        - `local_vars` (dict[str, Any] or None): The local variables of the function.
+        - `rendered_inputs` (list[str] or None): The rendered snapshot of the inputs.
+        - `input_digest` (bytes or None): The digest of the inputs before the call, None if they are not checked for mutations.
+        - `status` (str): The status of the call.
+
+        Returns:
+        - Result: The validation result.
+        """
+        if self._postprocess is not None and status == "OK":
+            result = self._postprocess(result)
+
+        mutated = False
+        if input_digest is not None:
+            try:
+                mutated = digest(inputs) != input_digest
+            except Exception:  # Made unpicklable by the function
+                mutated = True
+        found = None
+        recorded = None
+
+        if status == "OK":
+            if self._snapshots is not None:
+                data, recorded = self._resolve_snapshot(data, result)
+            found = self._compare_output(data, result)
+
+        return Result(
+            result,
+            stdout,
+            status == "OK" and found is None,
+            local_vars,
+            inputs=rendered_inputs,
+            mutated=mutated,
+            status=status,
+            mismatch=found,
+            snapshot=recorded,
+        )
+
+    def _resolve_snapshot(
+        self, data: _FuncModel, output: Any
+    ) -> tuple[_FuncModel, str | None]:
+        """
+        Replaces a snapshot reference in the expected output of a test case with the recorded output, recording
+        the actual output instead if the snapshot is missing or being updated.
+
+        Args:
+        - `data` (_FuncModel): The test case data.
+        - `output` (Any): The postprocessed output of the function.
+
+        Returns:
+        - tuple[_FuncModel, str | None]: The test case data with the expected output, and the path of the snapshot if it was recorded.
+        """
+        key = snapshot_key(data.output)
+        if key is None:
+            return data, None
+
+        if self._update_snapshots or self._snapshots.path(key) is None:
+            path = self._snapshots.save(key, output)
+            return replace(data, output=output), str(path)
+
+        return replace(data, output=self._snapshots.load(key)), None
+
+    def _is_exact(self, cases: list[_FuncModel]) -> bool:
+        """
+        Returns whether all the given test cases compare their output exactly.
+        """
+        if self._compare not in (None, "exact"):
+            return False
+        if self._compare is None and (
+            self._rel_tol is not None or self._abs_tol is not None
+        ):
+            return False
+
+        return not any(
+            key in data.options
+            for data in cases
+            for key in ("compare", "rel_tol", "abs_tol")
+        )
+
+    def _compare_output(self, data: _FuncModel, output: Any) -> str | None:
+        """
+        Compares the output of a test case with the expected output, using its comparator and tolerances.
+
+        Args:
+        - `data` (_FuncModel): The test case data.
+        - `output` (Any): The postprocessed output of the function.
+
+        Returns:
+        - str | None: None if the output matches, otherwise where it first differs, see `pysvt.utils.compare.mismatch`.
+        """
+        comparator = data.options.get("compare", self._compare)
+
+        if callable(comparator):
+            if comparator(output, data.output):
+                return None
+            return "output: rejected by the comparator"
+
+        rel_tol = data.options.get("rel_tol", self._rel_tol)
+        abs_tol = data.options.get("abs_tol", self._abs_tol)
+
+        if comparator is None:
+            no_tolerance = rel_tol is None and abs_tol is None
+            comparator = "exact" if no_tolerance else "approx"
+
+        return mismatch(
+            output,
+            data.output,
+            comparator,
+            1e-9 if rel_tol is None else rel_tol,
+            0.0 if abs_tol is None else abs_tol,
+        )
+
+
+registry: list[test] = []
+
+
+def run_all() -> tuple[int, int]:
+    """
+    Runs every lazy test registered so far, in the order they were decorated.
+
+    Returns:
+    - tuple[int, int]: The total number of test cases and the number of failed test cases across all tests.
+    """
+    total = 0
+    failures = 0
+
+    for suite in registry:
+        suite_total, suite_failures = suite.run()
+        total += suite_total
+        failures += suite_failures
+
+    return total, failures
+
+
+def _read_json_lines(f: IO[bytes]) -> Iterator[dict[str, Any]]:
+    """
+    Lazily reads one test case per non-empty line of a JSON Lines file.
+    """
+    with f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class inspect_locals:
+    def __init__(self) -> None:
+        ...
+
+    def __call__(self, obj: object) -> Any:
+        ...
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+from .store import JsonStore
+
+
+class BaselineStore(JsonStore):
+    """
+    A JSON file recording the time taken by every test case, keyed by the qualified name of the tested
+    function and the name of the test case.
+
+    Args:
+        path (Path): The path to the JSON file. It is created on the first save if it does not exist.
+    """
+
+    _IGNORED = False
+    _INDENT = 2
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+
+    def get(self, suite: str, case: str) -> float | None:
+        """
+        Returns the baseline time of the test case, if any.
+
+        Args:
+            suite (str): The qualified name of the tested function.
+            case (str): The name of the test case.
+
+        Returns:
+            float | None: The baseline time in seconds.
+        """
+        return self._suites.get(suite, {}).get(case)
+
+    def set(self, suite: str, case: str, seconds: float) -> None:
+        """
+        Records the baseline time of the test case.
+
+        Args:
+            suite (str): The qualified name of the tested function.
+            case (str): The name of the test case.
+            seconds (float): The time taken in seconds.
+        """
+        self._suites.setdefault(suite, {})[case] = seconds
+        self._changed.add(suite)
+
+
+def is_regression(
+    seconds: float,
+    baseline: float,
+    max_ratio: float | None,
+    max_delta: float | None,
+) -> bool:
+    """
+    Checks whether a time exceeds the allowed slowdown versus its baseline.
+
+    Args:
+        seconds (float): The measured time in seconds.
+        baseline (float): The baseline time in seconds.
+        max_ratio (float | None): The maximum allowed ratio of the measured time to the baseline.
+        max_delta (float | None): The maximum allowed difference between the measured time and the baseline, in seconds.
+
+    Returns:
+        bool: True if any of the given thresholds is exceeded.
+    """
+    if max_ratio is not None and seconds > baseline * max_ratio:
+        return True
+    if max_delta is not None and seconds - baseline > max_delta:
+        return True
+    return False
@@ -0,0 +1,99 @@
+import sys
+from typing import Any
+
+
+def stack(inputs: list[list[Any]]) -> list[Any]:
+    """
+    Transposes the inputs of every test case into one column per argument.
+
+    Columns are NumPy arrays if NumPy is installed, lists otherwise. Columns which do not make an array, such as
+    lists of different lengths, are left as lists.
+
+    Args:
+        inputs (list[list[Any]]): The inputs of every test case.
+
+    Returns:
+        list[Any]: One column per argument, holding the value of every test case.
+    """
+    columns = [list(column) for column in zip(*inputs)]
+
+    # Imported on first use, as it takes longer to import than pysvt itself
+    try:
+        import numpy as np
+    except ImportError:  # NumPy is optional, plain lists are used instead
+        return columns
+    return [_array(np, column) for column in columns]
+
+
+def _array(np: Any, column: list[Any]) -> Any:
+    try:
+        return np.asarray(column)
+    except ValueError:  # Ragged values
+        return column
+
+
+def split(outputs: Any, total: int) -> list[Any]:
+    """
+    Splits the output of a batched call into the output of every test case.
+
+    Args:
+        outputs (Any): The output of the batched call, a sequence or array with one item per test case.
+        total (int): The number of test cases.
+
+    Returns:
+        list[Any]: The output of every test case as plain Python values.
+
+    Raises:
+        ValueError: If the number of outputs differs from the number of test cases.
+    """
+    # Arrays only exist once NumPy is imported
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(outputs, np.ndarray):
+        outputs = outputs.tolist()
+    else:
+        outputs = list(outputs)
+
+    if len(outputs) != total:
+        raise ValueError(
+            f"Batched call returned {len(outputs)} outputs for {total} test cases"
+        )
+
+    return outputs
+
+
+def compare(actual: list[Any], expected: list[Any]) -> list[bool]:
+    """
+    Compares the outputs of every test case with the expected ones, with a single array comparison when possible.
+
+    Only numeric or boolean outputs of the same kind on both sides are compared as arrays, since NumPy converts
+    mixed values to a common type (such as `2` to `'2'`) and would then disagree with `==`.
+
+    Args:
+        actual (list[Any]): The output of every test case.
+        expected (list[Any]): The expected output of every test case.
+
+    Returns:
+        list[bool]: Whether every test case passed.
+    """
+    try:
+        import numpy as np
+    except ImportError:  # NumPy is optional, outputs are then compared one by one
+        np = None
+
+    if np is not None:
+        try:
+            actual_array = np.asarray(actual)
+            expected_array = np.asarray(expected)
+        except ValueError:  # Ragged outputs
+            actual_array = expected_array = None
+
+        if (
+            actual_array is not None
+            and actual_array.shape == expected_array.shape
+            and actual_array.dtype.kind == expected_array.dtype.kind
+            and actual_array.dtype.kind in "biuf"
+        ):
+            matches = actual_array == expected_array
+            return matches.reshape(len(actual), -1).all(axis=1).tolist()
+
+    return [a == e for a, e in zip(actual, expected)]
@@ -0,0 +1,76 @@
+import math
+import statistics
+import time
+from typing import Any, Callable
+
+from .ctx import capture_stdout
+from .models import Stats
+
+# Auto-calibration stops after this much time spent in the function
+CALIBRATION_TIME = 0.2
+CALIBRATION_MIN_RUNS = 5
+CALIBRATION_MAX_RUNS = 10_000
+
+
+def summarize(samples: list[float]) -> Stats:
+    """
+    Computes the statistics of the timing samples.
+
+    Args:
+        samples (list[float]): The time taken by every run, in seconds.
+
+    Returns:
+        Stats: The statistics of the samples.
+    """
+    ordered = sorted(samples)
+    p95 = ordered[max(math.ceil(0.95 * len(ordered)) - 1, 0)]
+
+    return Stats(
+        runs=len(ordered),
+        min=ordered[0],
+        median=statistics.median(ordered),
+        mean=statistics.fmean(ordered),
+        stddev=statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        p95=p95,
+    )
+
+
+def benchmark(
+    prepare: Callable[[], Callable[[], Any]], repeats: int | None, warmup: int
+) -> Stats:
+    """
+    Times repeated calls of a function, excluding any setup work.
+
+    `prepare` is called before every run to build the call (fresh instance, isolated inputs, etc)
+    and only the call itself is timed. Stdout is discarded.
+
+    Args:
+        prepare (Callable[[], Callable[[], Any]]): The function returning the call to time.
+        repeats (int | None): The number of timed runs, or None to run until `CALIBRATION_TIME` is spent, like `timeit`.
+        warmup (int): The number of untimed runs before the timed ones.
+
+    Returns:
+        Stats: The statistics of the timed runs.
+    """
+    samples = []
+
+    with capture_stdout():
+        for _ in range(warmup):
+            prepare()()
+
+        while True:
+            call = prepare()
+            start = time.perf_counter()
+            call()
+            samples.append(time.perf_counter() - start)
+
+            if repeats is not None:
+                if len(samples) >= repeats:
+                    break
+            elif len(samples) >= CALIBRATION_MAX_RUNS or (
+                len(samples) >= CALIBRATION_MIN_RUNS
+                and sum(samples) >= CALIBRATION_TIME
+            ):
+                break
+
+    return summarize(samples)
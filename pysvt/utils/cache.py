@@ -0,0 +1,122 @@
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+from pathlib import Path
+from typing import Any, Callable
+
+from .store import atomic_open, ignore_directory
+
+CACHE_DIR = Path(".pysvt_cache")
+
+# Bump whenever the layout of the cached data changes
+_VERSION = 5
+_MAGIC = b"PSVT"
+# Magic, version, modification time (ns), size and SHA-256 digest of the source file
+_HEADER = struct.Struct("<4sHqQ32s")
+_MISS = object()
+
+
+class FixtureCache:
+    """
+    An on-disk cache of parsed test case files.
+
+    Every entry is a binary blob made of a fixed size header describing the source file followed by the
+    pickled data. Entries are read through a memory map and are considered fresh when the size and
+    modification time of the file match the header, or when the file content still hashes to the same digest.
+
+    Args:
+        directory (str | Path): The directory holding the cache entries. Default is `.pysvt_cache`.
+
+    Attributes:
+        hits (int): The number of loads served from the cache.
+        misses (int): The number of loads which had to parse the file.
+    """
+
+    def __init__(self, directory: str | Path = CACHE_DIR) -> None:
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, path: Path, parse: Callable[[], Any]) -> Any:
+        """
+        Returns the cached data of the file, calling `parse` and storing its result when the entry is stale.
+
+        Args:
+            path (Path): The test case file.
+            parse (Callable[[], Any]): The function loading and parsing the file.
+
+        Returns:
+            Any: The parsed data.
+
+        Raises:
+            FileNotFoundError: If the specified file does not exist.
+        """
+        stat = path.stat()
+        entry = self._entry(path)
+
+        value = self._read(entry, path, stat)
+        if value is not _MISS:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        digest = hashlib.sha256(path.read_bytes()).digest()
+        value = parse()
+        self._write(entry, stat, digest, value)
+
+        return value
+
+    def invalidate(self, path: str | Path | None = None) -> None:
+        """
+        Removes the cache entry of the file, or every entry if no file is given.
+
+        Args:
+            path (str | Path | None): The test case file. Default is None.
+        """
+        if path is not None:
+            self._entry(Path(path)).unlink(missing_ok=True)
+        elif self.directory.is_dir():
+            for entry in self.directory.glob("*.bin"):
+                entry.unlink(missing_ok=True)
+
+    def _entry(self, path: Path) -> Path:
+        key = hashlib.sha256(str(path.resolve()).encode()).hexdigest()
+        return self.directory / f"{key}.bin"
+
+    def _read(self, entry: Path, path: Path, stat: os.stat_result) -> Any:
+        try:
+            with open(entry, "r+b") as f, mmap.mmap(f.fileno(), 0) as m:
+                magic, version, mtime_ns, size, digest = _HEADER.unpack_from(m)
+
+                if magic != _MAGIC or version != _VERSION or size != stat.st_size:
+                    return _MISS
+
+                if mtime_ns != stat.st_mtime_ns:
+                    if hashlib.sha256(path.read_bytes()).digest() != digest:
+                        return _MISS
+                    # Same content, so skip hashing next time
+                    _HEADER.pack_into(
+                        m, 0, magic, version, stat.st_mtime_ns, size, digest
+                    )
+
+                offset = _HEADER.size
+                with memoryview(m) as view:
+                    return pickle.loads(view[offset:])
+        except (OSError, ValueError, struct.error, pickle.UnpicklingError, EOFError):
+            return _MISS
+
+    def _write(
+        self, entry: Path, stat: os.stat_result, digest: bytes, value: Any
+    ) -> None:
+        ignore_directory(self.directory)
+
+        header = _HEADER.pack(_MAGIC, _VERSION, stat.st_mtime_ns, stat.st_size, digest)
+
+        with atomic_open(entry, "wb") as f:
+            f.write(header)
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+fixture_cache = FixtureCache()
@@ -0,0 +1,272 @@
+import hashlib
+import json
+import math
+import reprlib
+import sys
+from collections import Counter
+from itertools import compress, count
+from operator import ne
+from typing import Any
+
+COMPARATORS = ("exact", "approx", "unordered", "digest")
+DIGEST_ALGORITHM = "sha256"
+# Algorithms of `hashlib` usable in digests, leaving out those with a variable length like "shake_128"
+DIGEST_ALGORITHMS = frozenset(
+    name for name in hashlib.algorithms_available if not name.startswith("shake")
+)
+
+
+def _encode(value: Any) -> Any:
+    # Only called by `json` for values it cannot encode itself
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if isinstance(value, bytes):
+        return value.hex()
+    if hasattr(value, "tolist"):  # NumPy arrays and scalars
+        return value.tolist()
+    return repr(value)
+
+
+def output_digest(value: Any, algorithm: str = DIGEST_ALGORITHM) -> str:
+    """
+    Returns the digest of an output, to be written as the expected output of a test case compared with "digest".
+
+    The output is hashed as canonical JSON, with sorted keys and sets, so equal outputs always have the same digest.
+    Tuples hash like lists.
+
+    Args:
+        value (Any): The output.
+        algorithm (str): Any algorithm supported by `hashlib`. Default is "sha256".
+
+    Returns:
+        str: The digest, as `<algorithm>:<hex digest>`.
+    """
+    encoded = json.dumps(
+        value, sort_keys=True, separators=(",", ":"), default=_encode
+    ).encode()
+    return f"{algorithm}:{hashlib.new(algorithm, encoded).hexdigest()}"
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_array(value: Any) -> bool:
+    # NumPy is optional and only imported by the code creating arrays, outputs are otherwise never arrays
+    np = sys.modules.get("numpy")
+    return np is not None and isinstance(value, np.ndarray)
+
+
+def _locate_array(
+    actual: Any, expected: Any, path: str, rel_tol: float | None, abs_tol: float
+) -> str | None:
+    # Arrays compare element-wise, so `==` gives an array whose truth value is ambiguous
+    where = path or "output"
+
+    if not _is_array(actual) or not _is_array(expected):
+        return f"{where}: expected {reprlib.repr(expected)}, got {reprlib.repr(actual)}"
+
+    if actual.shape != expected.shape:
+        return f"{where}: expected shape {expected.shape}, got {actual.shape}"
+
+    if actual.dtype != expected.dtype:
+        return f"{where}: expected dtype {expected.dtype}, got {actual.dtype}"
+
+    import numpy as np
+
+    if np.array_equal(actual, expected):
+        return None
+
+    try:
+        differs = (
+            actual != expected
+            if rel_tol is None
+            else ~np.isclose(actual, expected, rtol=rel_tol, atol=abs_tol)
+        )
+    except TypeError:  # Tolerances only apply to numeric arrays
+        differs = actual != expected
+
+    if not differs.any():
+        return None
+
+    index = tuple(int(i) for i in np.argwhere(differs)[0])
+    if index:
+        where = f"{path}[{', '.join(map(str, index))}]"
+    return f"{where}: expected {reprlib.repr(expected[index])}, got {reprlib.repr(actual[index])}"
+
+
+def _equal(actual: Any, expected: Any) -> bool:
+    try:
+        return bool(actual == expected)
+    except ValueError:  # Containers of arrays, which are then compared item by item
+        return False
+
+
+def _locate(
+    actual: Any, expected: Any, path: str, rel_tol: float | None, abs_tol: float
+) -> str | None:
+    if _is_array(actual) or _is_array(expected):
+        return _locate_array(actual, expected, path, rel_tol, abs_tol)
+
+    # Equal subtrees are skipped at C speed, so only the diverging branch is walked
+    if _equal(actual, expected):
+        return None
+
+    if isinstance(actual, dict) and isinstance(expected, dict):
+        for key in expected:
+            if key not in actual:
+                return f"{path or 'output'}: missing key {reprlib.repr(key)}"
+
+        for key in actual:
+            if key not in expected:
+                return f"{path or 'output'}: unexpected key {reprlib.repr(key)}"
+
+        for key, value in expected.items():
+            found = _locate(actual[key], value, f"{path}[{key!r}]", rel_tol, abs_tol)
+            if found is not None:
+                return found
+
+        return None
+
+    if isinstance(actual, (list, tuple)) and isinstance(expected, (list, tuple)):
+        # The indices of the differing items are found without a Python level loop over the equal ones
+        try:
+            indices = list(compress(count(), map(ne, actual, expected)))
+        except ValueError:  # Items which are arrays
+            indices = range(min(len(actual), len(expected)))
+
+        for index in indices:
+            found = _locate(
+                actual[index], expected[index], f"{path}[{index}]", rel_tol, abs_tol
+            )
+            if found is not None:
+                return found
+
+        if len(actual) != len(expected):
+            return f"{path or 'output'}: expected length {len(expected)}, got {len(actual)}"
+
+        return None
+
+    if (
+        rel_tol is not None
+        and _is_number(actual)
+        and _is_number(expected)
+        and math.isclose(actual, expected, rel_tol=rel_tol, abs_tol=abs_tol)
+    ):
+        return None
+
+    return f"{path or 'output'}: expected {reprlib.repr(expected)}, got {reprlib.repr(actual)}"
+
+
+def _freeze(value: Any) -> Any:
+    # A hashable stand-in for unhashable items, equal for equal items
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, set):
+        return frozenset(value)
+
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def _count(items: Any) -> Counter:
+    try:
+        return Counter(items)
+    except TypeError:  # Unhashable items
+        return Counter(map(_freeze, items))
+
+
+def _unordered(actual: Any, expected: Any) -> str | None:
+    if not isinstance(actual, (list, tuple, set, frozenset)) or not isinstance(
+        expected, (list, tuple, set, frozenset)
+    ):
+        return _locate(actual, expected, "", None, 0.0)
+
+    actual_counts = _count(actual)
+    expected_counts = _count(expected)
+    # Counts are never zero, so the dictionaries can be compared directly instead of by the slower `Counter.__eq__`
+    if dict.__eq__(actual_counts, expected_counts):
+        return None
+
+    for item, times in expected_counts.items():
+        if actual_counts[item] != times:
+            return f"output: expected {times} of {reprlib.repr(item)}, got {actual_counts[item]}"
+
+    item = next(item for item in actual_counts if item not in expected_counts)
+    return f"output: unexpected {reprlib.repr(item)}"
+
+
+def mismatch(
+    actual: Any,
+    expected: Any,
+    comparator: str = "exact",
+    rel_tol: float = 1e-9,
+    abs_tol: float = 0.0,
+) -> str | None:
+    """
+    Compares an output with the expected output and locates the first mismatch, without rendering either of them.
+
+    Comparators:
+    - "exact": The outputs are equal.
+    - "approx": The outputs have the same structure, sequences of any type being interchangeable, and their numbers
+    are equal within `rel_tol` and `abs_tol` (see `math.isclose`).
+    - "unordered": The outputs hold the same items the same number of times, in any order. Items are counted by hash,
+    in linear time.
+    - "digest": The digest of the output (see `output_digest`) is the expected output.
+
+    Args:
+        actual (Any): The output of the function.
+        expected (Any): The expected output.
+        comparator (str): One of `COMPARATORS`. Default is "exact".
+        rel_tol (float): The relative tolerance of "approx". Default is 1e-9.
+        abs_tol (float): The absolute tolerance of "approx". Default is 0.0.
+
+    Returns:
+        str | None: None if the outputs match, otherwise the path of the first mismatch and the diverging values,
+        such as `[3]['total']: expected 2, got 3`.
+
+    Raises:
+        ValueError: If the comparator is unknown or the expected digest is not a string.
+    """
+    if comparator == "exact":
+        if _is_array(actual) or _is_array(expected):
+            return _locate_array(actual, expected, "", None, 0.0)
+
+        try:
+            if actual == expected:
+                return None
+        except ValueError:  # Containers of arrays are compared item by item
+            return _locate(actual, expected, "", None, 0.0)
+
+        # Falls back to the whole values when the mismatch is not structural, like a list compared with a tuple
+        return _locate(actual, expected, "", None, 0.0) or (
+            f"output: expected {reprlib.repr(expected)}, got {reprlib.repr(actual)}"
+        )
+
+    if comparator == "approx":
+        return _locate(actual, expected, "", rel_tol, abs_tol)
+
+    if comparator == "unordered":
+        return _unordered(actual, expected)
+
+    if comparator == "digest":
+        if not isinstance(expected, str):
+            raise ValueError(
+                "Expected output should be a digest string when comparing digests"
+            )
+
+        algorithm, _, _ = expected.partition(":")
+        if algorithm not in DIGEST_ALGORITHMS:
+            return f"output: expected digest should be `<algorithm>:<hex digest>` with an algorithm of hashlib, got {reprlib.repr(expected)}"
+
+        actual_digest = output_digest(actual, algorithm)
+        if actual_digest == expected:
+            return None
+        return f"output: expected digest {expected}, got {actual_digest}"
+
+    raise ValueError(f"Comparator should be one of {', '.join(COMPARATORS)}")
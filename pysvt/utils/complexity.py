@@ -0,0 +1,116 @@
+import math
+from typing import Callable
+
+# Ordered from the slowest to the fastest growing
+COMPLEXITIES: dict[str, Callable[[float], float]] = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log(n),
+    "O(n^2)": lambda n: n * n,
+    "O(2^n)": lambda n: 2.0**n,
+}
+# Powers of two from 16 to 4096
+DEFAULT_SIZES = [2**k for k in range(4, 13)]
+# A more complex model has to fit this much better than a simpler one to be picked
+_FIT_TOLERANCE = 0.9
+_ALIASES = {"²": "^2", "ⁿ": "^n", "**": "^"}
+
+
+def normalize(complexity: str) -> str:
+    """
+    Resolves the spelling of a complexity class, such as `O(n²)` or `O(nlogn)`, into one of `COMPLEXITIES`.
+
+    Args:
+        complexity (str): The complexity class.
+
+    Returns:
+        str: The complexity class as spelled in `COMPLEXITIES`.
+
+    Raises:
+        ValueError: If the complexity class is unknown.
+    """
+    spelled = complexity
+    for alias, name in _ALIASES.items():
+        spelled = spelled.replace(alias, name)
+    spelled = "".join(spelled.split())
+
+    for name in COMPLEXITIES:
+        if "".join(name.split()) == spelled:
+            return name
+
+    raise ValueError(f"Complexity should be one of {', '.join(COMPLEXITIES)}")
+
+
+def _residual(
+    model: Callable[[float], float], sizes: list[int], values: list[float]
+) -> float | None:
+    try:
+        xs = [model(n) for n in sizes]
+    except OverflowError:
+        return None
+
+    # Weighted least squares fit of `values = a * model(n) + b` with `a` positive. Timing noise is
+    # proportional to the time, so every value is weighted by its inverse square to get relative errors.
+    weights = [1 / max(y, 1e-12) ** 2 for y in values]
+    total = sum(weights)
+    mean_x = sum(w * x for w, x in zip(weights, xs)) / total
+    mean_y = sum(w * y for w, y in zip(weights, values)) / total
+    variance = sum(w * (x - mean_x) ** 2 for w, x in zip(weights, xs))
+
+    slope = 0.0
+    if variance > 0:
+        slope = (
+            sum(w * (x - mean_x) * (y - mean_y) for w, x, y in zip(weights, xs, values))
+            / variance
+        )
+        if slope < 0:
+            return None
+
+    intercept = mean_y - slope * mean_x
+    return sum(
+        w * (y - slope * x - intercept) ** 2 for w, x, y in zip(weights, xs, values)
+    )
+
+
+def fit(sizes: list[int], values: list[float]) -> str:
+    """
+    Finds the complexity class best describing how the values (times or memory) grow with the input size.
+
+    Every model of `COMPLEXITIES` is fitted with linear least squares, and the simplest one whose residual is
+    close to the smallest wins, which keeps measurement noise from promoting a linear function to `O(n log n)`.
+
+    Args:
+        sizes (list[int]): The input sizes, at least three distinct ones and all positive.
+        values (list[float]): The value measured for every size.
+
+    Returns:
+        str: The fitted complexity class.
+    """
+    residuals = {
+        name: residual
+        for name, model in COMPLEXITIES.items()
+        if (residual := _residual(model, sizes, values)) is not None
+    }
+    best = min(residuals.values())
+
+    return next(
+        name
+        for name, residual in residuals.items()
+        if residual * _FIT_TOLERANCE <= best
+    )
+
+
+def exceeds(complexity: str, bound: str) -> bool:
+    """
+    Checks whether a complexity class grows faster than the bound.
+
+    Args:
+        complexity (str): The complexity class.
+        bound (str): The bound, spelled as in `COMPLEXITIES`.
+
+    Returns:
+        bool: True if the complexity class grows faster than the bound.
+    """
+    names = list(COMPLEXITIES)
+    return names.index(complexity) > names.index(bound)
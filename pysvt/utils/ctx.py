@@ -1,4 +1,10 @@
+import sys
+import threading
 import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from io import StringIO
+from typing import Any, Iterator
 
 
 class Timer:
@@ -12,3 +18,59 @@ class Timer:
 
     def __exit__(self, *args):
         self._end = time.perf_counter()
+
+
+_stdout_buffer: ContextVar[StringIO | None] = ContextVar("_stdout_buffer", default=None)
+_stdout_lock = threading.Lock()
+_stdout_users = 0
+
+
+class _StdoutProxy:
+    """
+    Stand-in for `sys.stdout` that writes to the buffer of the current context (thread or task)
+    and falls back to the original stream everywhere else.
+    """
+
+    def __init__(self, stream: Any) -> None:
+        self._stream = stream
+
+    def write(self, data: str) -> int:
+        buffer = _stdout_buffer.get()
+        return (self._stream if buffer is None else buffer).write(data)
+
+    def flush(self) -> None:
+        if _stdout_buffer.get() is None:
+            self._stream.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+@contextmanager
+def capture_stdout() -> Iterator[StringIO]:
+    """
+    Captures stdout written by the current thread or task into a fresh buffer.
+
+    Unlike `contextlib.redirect_stdout`, concurrent captures do not clobber each other.
+
+    Yields:
+    - StringIO: The buffer receiving the captured output.
+    """
+    global _stdout_users
+
+    with _stdout_lock:
+        if _stdout_users == 0:
+            sys.stdout = _StdoutProxy(sys.stdout)
+        _stdout_users += 1
+
+    buffer = StringIO()
+    token = _stdout_buffer.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _stdout_buffer.reset(token)
+
+        with _stdout_lock:
+            _stdout_users -= 1
+            if _stdout_users == 0 and isinstance(sys.stdout, _StdoutProxy):
+                sys.stdout = sys.stdout._stream
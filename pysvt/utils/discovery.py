@@ -0,0 +1,136 @@
+import ast
+import fnmatch
+import os
+from pathlib import Path
+from typing import Iterator
+
+# Directories which never hold test modules
+SKIPPED_DIRS = {"__pycache__", "node_modules", "site-packages", "venv", "env"}
+# The pysvt package itself, whose sources mention `@test` without decorating anything with it
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+
+
+def module_name(target: str) -> str:
+    """
+    Converts a path to a Python file into a module name, leaving module names untouched.
+
+    Args:
+        target (str): A module name or the path to a Python file.
+
+    Returns:
+        str: The module name.
+    """
+    if target.endswith(".py") or os.sep in target or "/" in target:
+        return ".".join(Path(target).with_suffix("").parts)
+    return target
+
+
+def _is_test(decorator: ast.expr) -> bool:
+    # `test`, `pysvt.test` or a call of either
+    if isinstance(decorator, ast.Call):
+        decorator = decorator.func
+
+    if isinstance(decorator, ast.Name):
+        return decorator.id == "test"
+    return (
+        isinstance(decorator, ast.Attribute)
+        and decorator.attr == "test"
+        and isinstance(decorator.value, ast.Name)
+        and decorator.value.id == "pysvt"
+    )
+
+
+def has_tests(source: bytes) -> bool:
+    """
+    Checks whether Python source code decorates a function or class with `test`, such as `@test(...)` or
+    `@pysvt.test(...)`. Mentions in strings and comments do not count.
+
+    Args:
+        source (bytes): The source code.
+
+    Returns:
+        bool: Whether anything is decorated with `test`. False if the source is not valid Python.
+    """
+    # Most files never mention the decorator, so they are not parsed at all
+    if b"test" not in source:
+        return False
+
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return False
+
+    return any(
+        isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+        and any(_is_test(decorator) for decorator in node.decorator_list)
+        for node in ast.walk(tree)
+    )
+
+
+def _walk(directory: Path) -> Iterator[Path]:
+    for root, dirs, files in os.walk(directory):
+        # Pruned in place, so that hidden and virtual environment directories are not walked at all
+        dirs[:] = sorted(
+            d
+            for d in dirs
+            if not d.startswith(".")
+            and d not in SKIPPED_DIRS
+            and (Path(root) / d).resolve() != PACKAGE_DIR
+        )
+
+        for file in sorted(files):
+            if file.endswith(".py"):
+                yield Path(root) / file
+
+
+def discover(targets: list[str]) -> list[str]:
+    """
+    Finds the modules to test among module names, Python files and directories.
+
+    Directories are searched recursively for Python files decorating something with `test`, which is checked
+    on their source without importing them (see `has_tests`). The pysvt package itself is skipped.
+
+    Args:
+        targets (list[str]): Module names, paths to Python files or paths to directories.
+
+    Returns:
+        list[str]: The names of the modules, without duplicates.
+    """
+    modules: dict[str, None] = {}
+
+    for target in targets:
+        if not os.path.isdir(target):
+            modules[module_name(target)] = None
+            continue
+
+        for path in _walk(Path(target)):
+            try:
+                source = path.read_bytes()
+            except OSError:
+                continue
+
+            if has_tests(source):
+                modules[module_name(os.path.relpath(path))] = None
+
+    return list(modules)
+
+
+def matches(pattern: str, *texts: str) -> bool:
+    """
+    Checks whether any of the texts matches the pattern of the `-k` option.
+
+    Patterns with wildcards (`*`, `?` or `[`) are matched as globs against the whole text, any other pattern as
+    a substring. Both are case insensitive.
+
+    Args:
+        pattern (str): The pattern.
+        *texts (str): The texts, such as the qualified name of a test or the name and metadata of a test case.
+
+    Returns:
+        bool: Whether any text matches.
+    """
+    pattern = pattern.lower()
+
+    if any(char in pattern for char in "*?["):
+        return any(fnmatch.fnmatchcase(text.lower(), pattern) for text in texts)
+    return any(pattern in text.lower() for text in texts)
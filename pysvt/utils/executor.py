@@ -0,0 +1,138 @@
+import asyncio
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Iterable, Iterator
+
+EXECUTORS = ("serial", "thread", "process")
+
+_worker_fn: Callable[[Any], Any] | None = None
+
+
+def _init_worker(fn: Callable[[Any], Any]) -> None:
+    global _worker_fn
+    _worker_fn = fn
+
+
+def _call_worker(case: Any) -> Any:
+    assert _worker_fn is not None
+    return _worker_fn(case)
+
+
+def _bounded_map(
+    pool: Executor, fn: Callable[[Any], Any], cases: Iterable[Any], window: int
+) -> Iterator[tuple[Any, Any]]:
+    # Unlike `Executor.map`, only `window` cases are pulled from the iterable ahead of the
+    # consumer, which keeps memory bounded for lazily loaded cases
+    pending = deque()
+
+    try:
+        for case in cases:
+            pending.append((case, pool.submit(fn, case)))
+
+            if len(pending) >= window:
+                case, future = pending.popleft()
+                yield case, future.result()
+
+        while pending:
+            case, future = pending.popleft()
+            yield case, future.result()
+    finally:
+        # The consumer stopped early, so the cases which have not started yet are dropped
+        for _, future in pending:
+            future.cancel()
+
+
+def run_cases(
+    fn: Callable[[Any], Any],
+    cases: Iterable[Any],
+    executor: str = "serial",
+    workers: int | None = None,
+) -> Iterator[tuple[Any, Any]]:
+    """
+    Runs `fn` for every case and yields each case along with its return value in case order.
+
+    Closing the generator early cancels the cases which have not started yet.
+
+    Process pools use the `fork` start method so that `fn` (usually a bound method of the
+    decorator, closing over the function under test) is inherited by the workers instead of
+    being pickled. Only the case goes to the worker and only the return value comes back,
+    so both must be picklable.
+
+    Args:
+    - `fn` (Callable[[Any], Any]): The function executing a single case.
+    - `cases` (Iterable[Any]): The cases, which may be lazily generated.
+    - `executor` (str): One of "serial", "thread" or "process". Default is "serial".
+    - `workers` (int or None): The maximum number of workers of the pool. Default is None (the pool default).
+
+    Raises:
+    - `ValueError`: If the executor is unknown or process pools are not supported on this platform.
+    """
+    window = 2 * (workers or os.cpu_count() or 1)
+
+    if executor == "serial":
+        for case in cases:
+            yield case, fn(case)
+    elif executor == "thread":
+        with ThreadPoolExecutor(workers) as pool:
+            yield from _bounded_map(pool, fn, cases, window)
+    elif executor == "process":
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise ValueError("The process executor requires the fork start method")
+
+        with ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(fn,),
+        ) as pool:
+            yield from _bounded_map(pool, _call_worker, cases, window)
+    else:
+        raise ValueError(f"Executor should be one of {', '.join(EXECUTORS)}")
+
+
+def run_async_cases(
+    fn: Callable[[Any], Awaitable[Any]],
+    cases: Iterable[Any],
+    concurrency: int = 1,
+) -> Iterator[tuple[Any, Any]]:
+    """
+    Runs the coroutine function `fn` for every case on a new event loop and yields each case along with
+    its return value in case order.
+
+    At most `concurrency` cases run at the same time. The loop only runs while the consumer waits for
+    the next result, which keeps at most twice as many cases pulled from the iterable.
+
+    Args:
+    - `fn` (Callable[[Any], Awaitable[Any]]): The coroutine function executing a single case.
+    - `cases` (Iterable[Any]): The cases, which may be lazily generated.
+    - `concurrency` (int): The maximum number of cases running at the same time. Default is 1.
+    """
+    loop = asyncio.new_event_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    pending = deque()
+
+    async def limited(case: Any) -> Any:
+        async with semaphore:
+            return await fn(case)
+
+    try:
+        for case in cases:
+            pending.append((case, loop.create_task(limited(case))))
+
+            if len(pending) >= 2 * concurrency:
+                case, task = pending.popleft()
+                yield case, loop.run_until_complete(task)
+
+        while pending:
+            case, task = pending.popleft()
+            yield case, loop.run_until_complete(task)
+    finally:
+        for _, task in pending:
+            task.cancel()
+        if pending:
+            loop.run_until_complete(
+                asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+            )
+        loop.close()
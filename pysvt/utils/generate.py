@@ -0,0 +1,171 @@
+import random
+import re
+import string
+from typing import Any, Callable, Iterator
+
+TYPE_RE = re.compile(r"^(list|tuple|set)\[(.+)\]$")
+# Shrinking tries at most this many candidates per failing test case
+MAX_SHRINK_ATTEMPTS = 1000
+# Dropping single items is only tried for sequences up to this length, halving takes care of longer ones
+_DROP_ITEMS_LIMIT = 32
+
+
+def _value(spec: dict[str, Any]) -> Callable[[random.Random], Any]:
+    kind = spec.get("type", "int")
+
+    if "choices" in spec:
+        choices = list(spec["choices"])
+        return lambda rng: rng.choice(choices)
+
+    match = TYPE_RE.match(kind)
+    if match is not None:
+        container = {"list": list, "tuple": tuple, "set": set}[match.group(1)]
+        item = _value({**spec, "type": match.group(2), "len": spec.get("item_len")})
+        low, high = spec.get("len", [0, 10])
+        return lambda rng: container(item(rng) for _ in range(rng.randint(low, high)))
+
+    if kind == "int":
+        low, high = spec.get("min", -1000), spec.get("max", 1000)
+        return lambda rng: rng.randint(low, high)
+    if kind == "float":
+        low, high = spec.get("min", -1000.0), spec.get("max", 1000.0)
+        return lambda rng: rng.uniform(low, high)
+    if kind == "bool":
+        return lambda rng: rng.random() < 0.5
+    if kind == "str":
+        alphabet = spec.get("alphabet", string.ascii_letters + string.digits)
+        low, high = spec.get("len") or [0, 10]
+        return lambda rng: "".join(
+            rng.choice(alphabet) for _ in range(rng.randint(low, high))
+        )
+
+    raise ValueError(f"Unknown type {kind!r} in generator spec")
+
+
+def from_spec(
+    spec: dict[str, Any] | list[dict[str, Any]]
+) -> Callable[[random.Random], list[Any]]:
+    """
+    Creates an input generator from a declarative spec, such as `{ type = "list[int]", len = [0, 10000] }` in TOML.
+
+    Supported types are `int` and `float` (with `min` and `max`), `bool`, `str` (with `len` and `alphabet`) and
+    `list[...]`, `tuple[...]` and `set[...]` of those (with `len`, the items taking the remaining keys and `item_len`).
+    Any spec can give `choices` instead.
+
+    Args:
+        spec (dict[str, Any] | list[dict[str, Any]]): The spec of the only argument, or one spec per argument.
+
+    Returns:
+        Callable[[random.Random], list[Any]]: The generator of the inputs of a test case.
+
+    Raises:
+        ValueError: If a type is unknown.
+    """
+    specs = [spec] if isinstance(spec, dict) else spec
+    values = [_value(spec) for spec in specs]
+
+    return lambda rng: [value(rng) for value in values]
+
+
+def generate_inputs(
+    generator: Callable[[random.Random], list[Any]], examples: int, seed: int
+) -> Iterator[list[Any]]:
+    """
+    Lazily yields the inputs of the given number of test cases.
+
+    Every test case gets its own random number generator seeded from the seed and its index, so that any test
+    case can be reproduced on its own.
+
+    Args:
+        generator (Callable[[random.Random], list[Any]]): The generator of the inputs of a test case.
+        examples (int): The number of test cases.
+        seed (int): The seed.
+
+    Yields:
+        list[Any]: The inputs of a test case.
+    """
+    for index in range(examples):
+        yield list(generator(random.Random(f"{seed}:{index}")))
+
+
+def _candidates(value: Any) -> Iterator[Any]:
+    # Simpler values first, so that shrinking converges quickly
+    if isinstance(value, bool):
+        if value:
+            yield False
+    elif isinstance(value, int):
+        if value != 0:
+            yield 0
+            yield value // 2
+            yield value - (1 if value > 0 else -1)
+    elif isinstance(value, float):
+        if value != 0.0:
+            yield 0.0
+            yield float(int(value))
+            yield value / 2
+    elif isinstance(value, (str, list, tuple)):
+        if len(value) == 0:
+            return
+
+        half = len(value) // 2
+        yield value[:0]
+        yield value[:half]
+        yield value[half:]
+
+        if len(value) <= _DROP_ITEMS_LIMIT:
+            for index in range(len(value)):
+                rest = index + 1
+                yield value[:index] + value[rest:]
+
+        if not isinstance(value, str):
+            for index, item in enumerate(value):
+                for candidate in _candidates(item):
+                    items = list(value)
+                    items[index] = candidate
+                    yield type(value)(items)
+    elif isinstance(value, set):
+        for candidate in _candidates(sorted(value, key=repr)):
+            yield set(candidate)
+
+
+def shrink(
+    inputs: list[Any],
+    fails: Callable[[list[Any]], bool],
+    max_attempts: int = MAX_SHRINK_ATTEMPTS,
+) -> list[Any]:
+    """
+    Greedily simplifies the inputs of a failing test case while it keeps failing.
+
+    Numbers are moved towards zero and sequences are emptied, halved and stripped of single items, one
+    argument at a time, until no simpler candidate fails or the attempts run out.
+
+    Args:
+        inputs (list[Any]): The inputs of the failing test case.
+        fails (Callable[[list[Any]], bool]): Checks whether the test case fails with the given inputs.
+        max_attempts (int): The maximum number of candidates tried. Default is `MAX_SHRINK_ATTEMPTS`.
+
+    Returns:
+        list[Any]: The simplest failing inputs found.
+    """
+    attempts = 0
+    shrunk = True
+
+    while shrunk:
+        shrunk = False
+
+        for index, value in enumerate(inputs):
+            for candidate in _candidates(value):
+                if candidate == value:
+                    continue
+                if attempts >= max_attempts:
+                    return inputs
+                attempts += 1
+
+                trial = list(inputs)
+                trial[index] = candidate
+                if fails(trial):
+                    inputs = trial
+                    shrunk = True
+                    break
+
+    return inputs
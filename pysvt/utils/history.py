@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from .cache import CACHE_DIR
+from .store import JsonStore
+
+
+class HistoryStore(JsonStore):
+    """
+    A JSON file recording whether every test case failed in its last run and the time it took, keyed by the
+    qualified name of the tested function and the name of the test case.
+
+    Args:
+        path (Path): The path to the JSON file. Default is `.pysvt_cache/history.json`.
+    """
+
+    def __init__(self, path: Path = CACHE_DIR / "history.json") -> None:
+        super().__init__(path)
+
+    def priority(self, suite: str, case: str) -> tuple[bool, float]:
+        """
+        Returns the sort key of the test case, ordering the test cases which failed last time first and then
+        the fastest ones. Test cases without history come right after the failed ones.
+
+        Args:
+            suite (str): The qualified name of the tested function.
+            case (str): The name of the test case.
+
+        Returns:
+            tuple[bool, float]: Whether the test case passed last time and the time it took.
+        """
+        failed, seconds = self._suites.get(suite, {}).get(case, (False, 0.0))
+        return not failed, seconds
+
+    def set(self, suite: str, case: str, failed: bool, seconds: float) -> None:
+        """
+        Records the outcome of the test case.
+
+        Args:
+            suite (str): The qualified name of the tested function.
+            case (str): The name of the test case.
+            failed (bool): Whether the test case failed.
+            seconds (float): The time taken in seconds.
+        """
+        self._suites.setdefault(suite, {})[case] = (failed, seconds)
+        self._changed.add(suite)
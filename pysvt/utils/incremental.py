@@ -0,0 +1,143 @@
+import hashlib
+import inspect
+import types
+from pathlib import Path
+from typing import Any
+
+from .cache import CACHE_DIR
+from .store import JsonStore
+
+
+def _top_package(obj: Any) -> str | None:
+    module = getattr(obj, "__module__", None)
+    return None if module is None else module.split(".")[0]
+
+
+def _hash_code(
+    code: types.CodeType, h: Any, globals_: dict[str, Any], seen: set[int]
+) -> list[Any]:
+    # Line numbers and file names are left out, so that moving a function does not change it
+    h.update(code.co_code)
+    h.update(repr((code.co_names, code.co_varnames, code.co_freevars)).encode())
+    callees = [globals_.get(name) for name in code.co_names]
+
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            callees += _hash_code(const, h, globals_, seen)
+        elif isinstance(const, frozenset):
+            # The iteration order of sets of strings changes with every interpreter run
+            h.update(repr(sorted(map(repr, const))).encode())
+        else:
+            h.update(repr(const).encode())
+
+    return callees
+
+
+def _hash_object(obj: Any, h: Any, package: str, seen: set[int]) -> None:
+    obj = getattr(obj, "__func__", obj)
+
+    if id(obj) in seen or _top_package(obj) != package:
+        return
+    seen.add(id(obj))
+
+    if inspect.isclass(obj):
+        h.update(obj.__qualname__.encode())
+        for base in obj.__bases__:
+            _hash_object(base, h, package, seen)
+        for name, member in sorted(vars(obj).items()):
+            if isinstance(member, (staticmethod, classmethod, property)):
+                member = getattr(member, "__func__", None) or member.fget
+            if inspect.isfunction(member):
+                h.update(name.encode())
+                _hash_object(member, h, package, seen)
+    elif inspect.isfunction(obj):
+        h.update(obj.__qualname__.encode())
+        callees = _hash_code(obj.__code__, h, obj.__globals__, seen)
+        callees += [cell.cell_contents for cell in obj.__closure__ or ()]
+
+        for callee in callees:
+            _hash_object(callee, h, package, seen)
+
+
+def fingerprint(*objs: Any) -> str:
+    """
+    Hashes the code of the given functions and classes along with the functions and classes they reference.
+
+    Referenced globals and closure variables are followed transitively as long as they are defined in the same
+    top level package as the object referencing them, which leaves the standard library and third party
+    packages out. Constants, names and bytecode are hashed, but not line numbers.
+
+    Args:
+        *objs (Any): The functions and classes to hash. None values are ignored.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    seen: set[int] = set()
+
+    for obj in objs:
+        if obj is not None:
+            _hash_object(obj, h, _top_package(obj), seen)
+
+    return h.hexdigest()
+
+
+class ResultStore(JsonStore):
+    """
+    A JSON file recording which test cases passed, keyed by the qualified name of the tested function.
+
+    The passed test cases of a function are forgotten as soon as its fingerprint changes.
+
+    Args:
+        path (Path): The path to the JSON file. Default is `.pysvt_cache/results.json`.
+    """
+
+    def __init__(self, path: Path = CACHE_DIR / "results.json") -> None:
+        super().__init__(path)
+
+    def passed(self, suite: str, fingerprint: str) -> set[str]:
+        """
+        Returns the keys of the test cases which passed with the same fingerprint.
+
+        The returned set is updated in place by `set`.
+
+        Args:
+            suite (str): The qualified name of the tested function.
+            fingerprint (str): The current fingerprint of the tested function.
+
+        Returns:
+            set[str]: The keys of the passed test cases.
+        """
+        entry = self._suites.get(suite)
+
+        if entry is None or entry["fingerprint"] != fingerprint:
+            entry = {"fingerprint": fingerprint, "passed": []}
+            self._suites[suite] = entry
+            self._changed.add(suite)
+
+        if not isinstance(entry["passed"], set):
+            entry["passed"] = set(entry["passed"])
+        return entry["passed"]
+
+    def set(self, suite: str, key: str, passed: bool) -> None:
+        """
+        Records whether the test case passed.
+
+        Args:
+            suite (str): The qualified name of the tested function.
+            key (str): The key of the test case.
+            passed (bool): Whether the test case passed.
+        """
+        cases = self._suites[suite]["passed"]
+
+        if passed and key not in cases:
+            cases.add(key)
+            self._changed.add(suite)
+        elif not passed and key in cases:
+            cases.discard(key)
+            self._changed.add(suite)
+
+    def _encode(self, suite: str) -> Any:
+        entry = self._suites[suite]
+        return {"fingerprint": entry["fingerprint"], "passed": sorted(entry["passed"])}
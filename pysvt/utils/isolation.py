@@ -0,0 +1,55 @@
+import hashlib
+import pickle
+from copy import deepcopy
+from typing import Any, Callable
+
+ISOLATIONS = ("deepcopy", "pickle", "snapshot", "none")
+
+
+def isolate(inputs: list[Any], isolation: str) -> list[Any]:
+    """
+    Returns the inputs to pass to the tested function so that mutations do not leak into the test case data.
+
+    Args:
+        inputs (list[Any]): The inputs of the test case.
+        isolation (str): One of "deepcopy", "pickle" (a faster round-trip for plain data),
+            "snapshot" or "none". The last two pass the inputs as they are.
+
+    Returns:
+        list[Any]: The inputs to pass to the function.
+    """
+    if isolation == "deepcopy":
+        return deepcopy(inputs)
+    if isolation == "pickle":
+        return pickle.loads(pickle.dumps(inputs, protocol=pickle.HIGHEST_PROTOCOL))
+    return inputs
+
+
+def snapshot(inputs: list[Any], render: Callable[[Any], str] = str) -> list[str]:
+    """
+    Renders the printable representation of the inputs before they can be mutated.
+
+    Args:
+        inputs (list[Any]): The inputs of the test case.
+        render (Callable[[Any], str]): Renders an input, such as `Printer.format` which truncates large
+            inputs without rendering them in full. Default is `str`.
+
+    Returns:
+        list[str]: The rendered inputs.
+    """
+    return [render(value) for value in inputs]
+
+
+def digest(inputs: list[Any]) -> bytes:
+    """
+    Hashes the pickled inputs, which is used to detect mutations.
+
+    Args:
+        inputs (list[Any]): The inputs of the test case.
+
+    Returns:
+        bytes: The digest of the inputs.
+    """
+    return hashlib.blake2b(
+        pickle.dumps(inputs, protocol=pickle.HIGHEST_PROTOCOL)
+    ).digest()
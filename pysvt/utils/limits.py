@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+import signal
+from multiprocessing.connection import Connection
+from typing import Any, Callable
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def _current_memory() -> int:
+    # The address space limit applies to the whole process, which already holds the interpreter
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return 0
+
+
+def _child(fn: Callable[[], Any], conn: Connection, max_memory: int | None) -> None:
+    if max_memory is not None:
+        limit = _current_memory() + max_memory
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+    try:
+        message = ("OK", fn())
+    except MemoryError:
+        message = ("OOM", None)
+    except BaseException as e:
+        message = ("RAISE", e)
+
+    try:
+        conn.send(message)
+    except Exception as e:
+        conn.send(("RAISE", RuntimeError(f"Unable to send the result back: {e!r}")))
+    finally:
+        conn.close()
+        os._exit(0)
+
+
+def run_limited(
+    fn: Callable[[], Any], timeout: float | None, max_memory: int | None
+) -> tuple[str, Any]:
+    """
+    Runs a function in a forked process, killing it when it exceeds the given time or memory.
+
+    Exceptions raised by the function are raised again in the calling process.
+
+    Args:
+        fn (Callable[[], Any]): The function to run. Its return value must be picklable.
+        timeout (float | None): The maximum time in seconds.
+        max_memory (int | None): The maximum memory in bytes that the function may allocate.
+
+    Returns:
+        tuple[str, Any]: "OK" and the return value of the function, or "TIMEOUT" or "OOM" and None.
+
+    Raises:
+        ValueError: If the limits cannot be enforced on this platform.
+    """
+    if "fork" not in multiprocessing.get_all_start_methods():
+        raise ValueError("Timeouts and memory limits require the fork start method")
+    if max_memory is not None and resource is None:
+        raise ValueError("Memory limits are not supported on this platform")
+
+    ctx = multiprocessing.get_context("fork")
+    reader, writer = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_child, args=(fn, writer, max_memory), daemon=True)
+    process.start()
+    writer.close()
+
+    try:
+        if not reader.poll(timeout):
+            process.kill()
+            return "TIMEOUT", None
+
+        try:
+            status, value = reader.recv()
+        except EOFError:
+            # Killed before reporting back, e.g. by the kernel when running out of memory
+            process.join()
+            if process.exitcode == -signal.SIGKILL:
+                return "OOM", None
+            raise RuntimeError(f"Test case process exited with code {process.exitcode}")
+    finally:
+        reader.close()
+        process.join()
+
+    if status == "RAISE":
+        raise value
+    return status, value
@@ -0,0 +1,33 @@
+import tracemalloc
+from typing import Any, Callable
+
+
+def trace_memory(fn: Callable[[], Any]) -> tuple[Any, int, int]:
+    """
+    Calls the function while tracing Python memory allocations and returns the peak allocated on top of what
+    was allocated before the call, and how much of it is still allocated after the call.
+
+    Tracing is started and stopped around the call unless it is already running, in which case its peak is reset.
+
+    Args:
+        fn (Callable[[], Any]): The function to call.
+
+    Returns:
+        tuple[Any, int, int]: The return value, the peak memory and the net retained memory in bytes.
+    """
+    tracing = tracemalloc.is_tracing()
+
+    if tracing:
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.start()
+
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = fn()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    return result, max(peak - before, 0), after - before
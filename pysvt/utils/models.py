@@ -1,13 +1,15 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 
-@dataclass(frozen=True)
+# Not frozen, as the frozen `__init__` makes creating hundreds of thousands of test cases twice as slow
+@dataclass(slots=True)
 class _FuncModel:
     inputs: list[Any]
     output: Any
     name: str
     metadata: str
+    options: dict[str, Any] = field(default_factory=dict)
 
 
 @dataclass()
@@ -16,9 +18,50 @@ class _ClsModel:
     data: list[_FuncModel]
 
 
+@dataclass(frozen=True)
+class _FixtureModel:
+    inputs: list[Any]
+    outputs: list[Any]
+    metadata: list[str]
+    name: list[str]
+    init: list[Any]
+    options: list[dict[str, Any]]
+    # The key holding the inputs, named by errors about them
+    input_key: str = "i"
+
+
+@dataclass(frozen=True)
+class Stats:
+    runs: int
+    min: float
+    median: float
+    mean: float
+    stddev: float
+    p95: float
+
+
 @dataclass(frozen=True)
 class Result:
     data: Any
     stdout: str | None
     valid: bool
     local_vars: dict[str, Any] | None
+    locals_overhead: float | None = None
+    inputs: list[str] | None = None
+    mutated: bool = False
+    stats: Stats | None = None
+    regressed: bool = False
+    baseline: float | None = None
+    time: float | None = None
+    # One of "OK", "ERROR" (an exception was raised), "TIMEOUT" or "OOM"
+    status: str = "OK"
+    peak_memory: int | None = None
+    net_memory: int | None = None
+    peak_exceeded: bool = False
+    # The name, own time and cumulative time of the hottest functions, by own time
+    hotspots: list[tuple[str, float, float]] | None = None
+    profile: str | None = None
+    # Where the output first differs from the expected output, see `pysvt.utils.compare.mismatch`
+    mismatch: str | None = None
+    # The path of the snapshot recorded from the output, if any
+    snapshot: str | None = None
@@ -1,11 +1,17 @@
 import inspect
+import reprlib
+from typing import Any
 
 from rich.console import Console
 from rich.layout import Layout
 from rich.panel import Panel
 from rich.status import Status
+from rich.table import Table
 
-from .models import Result, _FuncModel
+from .complexity import exceeds
+from .models import Result, Stats, _FuncModel
+
+REGRESSIONS_SHOWN = 10
 
 
 class Printer:
@@ -14,6 +20,7 @@ class Printer:
 
     Args:
         console (Console): The console object used for printing.
+        max_length (int | None): The maximum number of characters shown for a value, or None for no limit. Default is 1000.
 
     Methods:
         init() -> Status:
@@ -22,9 +29,18 @@ class Printer:
         post_validation(res: Result, data: _FuncModel, time_taken: float, show_error_only: bool) -> None:
             Updates the information after validating a test case in normal mode.
 
-        finish(total: int, failures: int) -> None:
+        format(value: Any) -> str:
+            Formats a value shown in a panel, truncating it to the maximum length.
+
+        finish(total: int, failures: int, benchmarks: list[tuple[str, Stats]] | None,
+               regressions: list[tuple[str, float, float]] | None, skipped: int,
+               memory: list[tuple[str, int, int]] | None) -> None:
             Prints the final test results.
 
+        complexity(sizes: list[int], times: list[float], peaks: list[int], time_complexity: str,
+                   memory_complexity: str, bound: str | None) -> None:
+            Prints the measurements and the fitted complexity of a complexity analysis.
+
         traceback() -> None:
             Prints the traceback of an exception.
 
@@ -36,11 +52,27 @@ class Printer:
 
         number(data: int) -> str:
             Formats the given data as a number message.
+
+        duration(seconds: float) -> str:
+            Formats the given duration in milliseconds or seconds.
+
+        memory(size: int) -> str:
+            Formats the given number of bytes in B, KiB or MiB.
     """
 
-    def __init__(self, console: Console) -> None:
+    def __init__(self, console: Console, max_length: int | None = 1000) -> None:
         self._console = console
         self._layout = Layout()
+        self._max_length = max_length
+        self._args_obj: object = None
+        self._input_args: list[str] = []
+
+        # Limits the items rendered from large containers so their full repr is never built
+        self._repr = reprlib.Repr()
+        if max_length is not None:
+            for attr in ("maxstring", "maxother", "maxlist", "maxtuple", "maxdict"):
+                setattr(self._repr, attr, max_length)
+            self._repr.maxset = self._repr.maxfrozenset = max_length
 
     def init(self) -> Status:
         """
@@ -69,59 +101,230 @@ class Printer:
             time_taken (float): The time taken for the validation.
             show_error_only (bool): Flag indicating whether to show only the error panel.
         """
-        input_args = inspect.getfullargspec(obj).args
+        # Decide first, so that nothing is formatted for the panels which are not shown
+        if show_error_only and res.valid:
+            return
+
+        if obj is not self._args_obj:
+            self._args_obj = obj
+            self._input_args = inspect.getfullargspec(obj).args
 
         input_title_str = f"""{Printer.bold("Input")} -"""
-        input_str = "\n".join(
-            map(lambda t: f"    {t[0]} - {t[1]}", zip(input_args, data.inputs))
+        # Inputs snapshot before the call are formatted already
+        inputs, format_input = (
+            (data.inputs, self.format) if res.inputs is None else (res.inputs, str)
         )
+        methods = data.options.get("methods")
+        if methods is None:
+            input_str = "\n".join(
+                map(
+                    lambda t: f"    {t[0]} - {format_input(t[1])}",
+                    zip(self._input_args, inputs or []),
+                )
+            )
+        else:
+            # One call per method of the sequence, with its arguments
+            input_str = "\n".join(
+                f"    {method} - {format_input(args)}"
+                for method, args in zip(methods, inputs or [])
+            )
         input_str = "    None" if input_str.strip() == "" else input_str
 
-        exp_out_str = f"""{Printer.bold("Expected output")} - {data.output}"""
-        act_out_str = f"""{Printer.bold("Actual output")} - {res.data}"""
+        exp_out_str = (
+            f"""{Printer.bold("Expected output")} - {self.format(data.output)}"""
+        )
+        act_out_str = f"""{Printer.bold("Actual output")} - {self.format(res.data)}"""
 
         out_str = f"{input_title_str}\n{input_str}\n{exp_out_str}\n{act_out_str}"
 
+        if res.mismatch is not None:
+            out_str += f"""\n{Printer.bold("Mismatch")} - {Printer.error(self.format(res.mismatch))}"""
+
+        if res.snapshot is not None:
+            out_str += f"""\n{Printer.bold("Snapshot")} - recorded to {res.snapshot}"""
+
+        if res.mutated:
+            out_str += (
+                f"""\n\n{Printer.error("The inputs were mutated by the function")}"""
+            )
+
         if res.stdout is not None and res.stdout.strip() != "":
-            out_str += f"""\n\n{Printer.bold("Stdout")} -\n{res.stdout.strip()}"""
+            out_str += (
+                f"""\n\n{Printer.bold("Stdout")} -\n{self.format(res.stdout.strip())}"""
+            )
 
         if res.local_vars is not None:
             out_str += f"""\n\n{Printer.bold("Local variables")} -"""
 
+            if res.locals_overhead is not None:
+                out_str += f" (captured in {Printer.duration(res.locals_overhead)})"
+
             for k, v in res.local_vars.items():
-                out_str += f"\n    {k} - {v}"
+                out_str += f"\n    {k} - {self.format(v)}"
+
+        if res.stats is not None:
+            out_str += f"""\n\n{Printer.bold("Benchmark")} - {res.stats.runs} runs"""
+
+            for k in ("min", "median", "mean", "stddev", "p95"):
+                out_str += f"\n    {k} - {Printer.duration(getattr(res.stats, k))}"
+
+        if res.hotspots is not None:
+            out_str += f"""\n\n{Printer.bold("Profile")} - {res.profile}"""
+
+            for name, own, cumulative in res.hotspots:
+                out_str += f"\n    {self.format(name)} - {Printer.duration(own)} own, {Printer.duration(cumulative)} total"
+
+        if res.baseline is not None and res.time is not None:
+            baseline_str = f"{Printer.duration(res.time)} vs {Printer.duration(res.baseline)} ({res.time / res.baseline:.2f}x)"
+            if res.regressed:
+                baseline_str = Printer.error(baseline_str)
+            out_str += f"""\n\n{Printer.bold("Baseline")} - {baseline_str}"""
+
+        subtitle = f"Time taken: {Printer.duration(time_taken)}"
+        if res.peak_memory is not None:
+            memory_str = f"Peak memory: {Printer.memory(res.peak_memory)} (net {Printer.memory(res.net_memory)})"
+            if res.peak_exceeded:
+                memory_str = Printer.error(memory_str)
+            subtitle += f" | {memory_str}"
 
         emoji = ":white_check_mark:" if res.valid else ":cross_mark:"
-        time_str = (
-            f"{time_taken * 1000:.3f} ms" if time_taken < 1.0 else f"{time_taken:.3f} s"
-        )
+        status_str = "" if res.status == "OK" else f" {Printer.error(res.status)}"
         panel = Panel(
             out_str,
-            title=f"{emoji}  {data.name}",
-            subtitle=f"Time taken: {time_str}",
+            title=f"{emoji}  {data.name}{status_str}",
+            subtitle=subtitle,
             subtitle_align="right",
         )
 
-        if show_error_only and res.valid:
-            self._console.print(panel)
-            return
         self._console.print(panel)
 
-    def finish(self, total: int, failures: int) -> None:
+    def finish(
+        self,
+        total: int,
+        failures: int,
+        benchmarks: list[tuple[str, Stats]] | None = None,
+        regressions: list[tuple[str, float, float]] | None = None,
+        skipped: int = 0,
+        memory: list[tuple[str, int, int]] | None = None,
+    ) -> None:
         """
         Prints the final test execution summary.
 
         Args:
             total (int): The total number of tests executed.
             failures (int): The number of tests that failed.
+            benchmarks (list[tuple[str, Stats]] | None): The names and benchmark statistics of the tests, if any.
+            regressions (list[tuple[str, float, float]] | None): The names, baseline times and times of the tests slower than their baseline, if any.
+            skipped (int): The number of tests which were not executed. Default is 0.
+            memory (list[tuple[str, int, int]] | None): The names, peak memory and net retained memory of the tests, if profiled.
         """
+        if benchmarks:
+            table = Table("Test case", "Runs", "Min", "Median", "Mean", "Stddev", "P95")
+
+            for name, stats in benchmarks:
+                table.add_row(
+                    name,
+                    str(stats.runs),
+                    *map(
+                        Printer.duration,
+                        (stats.min, stats.median, stats.mean, stats.stddev, stats.p95),
+                    ),
+                )
+            self._console.print(table)
+
+        if regressions:
+            table = Table("Regressed test case", "Time", "Baseline", "Slowdown")
+
+            for name, baseline, seconds in sorted(
+                regressions, key=lambda r: r[2] / r[1], reverse=True
+            )[:REGRESSIONS_SHOWN]:
+                table.add_row(
+                    name,
+                    Printer.duration(seconds),
+                    Printer.duration(baseline),
+                    Printer.error(f"{seconds / baseline:.2f}x"),
+                )
+            self._console.print(table)
+
+        if memory:
+            name, peak, _ = max(memory, key=lambda m: m[1])
+            net = sum(m[2] for m in memory)
+            self._console.print(
+                f"{Printer.bold('Peak memory')} - {Printer.memory(peak)} ({name}) | "
+                f"{Printer.bold('Net retained memory')} - {Printer.memory(net)}"
+            )
+
         success = Printer.success(f"{total - failures} passed")
         failure = Printer.error(f"{failures} failed")
 
         status = (
             Printer.success("SUCCESS") if failures == 0 else Printer.error("FAILURE")
         )
-        self._console.print(f"{status} | {success} | {failure}")
+        summary = f"{status} | {success} | {failure}"
+        if skipped:
+            summary += f" | {Printer.number(skipped)} skipped"
+        self._console.print(summary)
+
+    def complexity(
+        self,
+        sizes: list[int],
+        times: list[float],
+        peaks: list[int],
+        time_complexity: str,
+        memory_complexity: str,
+        bound: str | None,
+    ) -> None:
+        """
+        Prints the measurements and the fitted complexity of a complexity analysis.
+
+        Args:
+            sizes (list[int]): The input sizes.
+            times (list[float]): The minimum time taken for every input size.
+            peaks (list[int]): The peak memory in bytes for every input size.
+            time_complexity (str): The fitted time complexity.
+            memory_complexity (str): The fitted memory complexity.
+            bound (str | None): The bound of the time complexity, if any.
+        """
+        table = Table("Size", "Time", "Peak memory")
+
+        for size, seconds, peak in sorted(zip(sizes, times, peaks)):
+            table.add_row(str(size), Printer.duration(seconds), Printer.memory(peak))
+        self._console.print(table)
+
+        time_str = time_complexity
+        if bound is not None:
+            time_str = f"{time_complexity} (bound {bound})"
+            if exceeds(time_complexity, bound):
+                time_str = Printer.error(time_str)
+
+        self._console.print(f"{Printer.bold('Time complexity')} - {time_str}")
+        self._console.print(
+            f"{Printer.bold('Memory complexity')} - {memory_complexity}"
+        )
+
+    def format(self, value: Any) -> str:
+        """
+        Formats a value shown in a panel, truncating it to the maximum length.
+
+        Containers are rendered with `reprlib`, which stops after enough items instead of rendering them all.
+
+        Args:
+            value (Any): The value to be formatted.
+
+        Returns:
+            str: The formatted value.
+        """
+        if self._max_length is None:
+            return str(value)
+
+        if isinstance(value, (list, tuple, dict, set, frozenset)):
+            text = self._repr.repr(value)
+        else:
+            text = str(value)
+
+        if len(text) <= self._max_length:
+            return text
+        return f"{text[: self._max_length]}... ({len(text) - self._max_length} more characters)"
 
     def traceback(self):
         """
@@ -181,3 +384,33 @@ class Printer:
 
         """
         return f"[bold blue]{data}[/bold blue]"
+
+    @staticmethod
+    def duration(seconds: float) -> str:
+        """
+        Formats the given duration in milliseconds, or seconds if it is longer than a second.
+
+        Args:
+            seconds (float): The duration in seconds.
+
+        Returns:
+            str: The formatted duration.
+        """
+        return f"{seconds * 1000:.3f} ms" if seconds < 1.0 else f"{seconds:.3f} s"
+
+    @staticmethod
+    def memory(size: int) -> str:
+        """
+        Formats the given number of bytes in B, KiB or MiB.
+
+        Args:
+            size (int): The number of bytes.
+
+        Returns:
+            str: The formatted size.
+        """
+        if abs(size) < 1024:
+            return f"{size} B"
+        if abs(size) < 1024**2:
+            return f"{size / 1024:.1f} KiB"
+        return f"{size / 1024 ** 2:.1f} MiB"
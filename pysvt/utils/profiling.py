@@ -0,0 +1,143 @@
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable
+
+PROFILERS = ("cprofile", "sampling")
+PROFILE_DIR = Path(".pysvt_profiles")
+# Time between two samples of the sampling profiler, in seconds
+SAMPLING_INTERVAL = 0.001
+
+_UNSAFE_RE = re.compile(r"[^\w-]+")
+
+
+def profile_path(directory: Path, suite: str, case: str) -> Path:
+    """
+    Returns the path of the profile of a test case, without suffix.
+
+    Args:
+        directory (Path): The directory holding the profiles.
+        suite (str): The qualified name of the tested function.
+        case (str): The name of the test case.
+
+    Returns:
+        Path: The path of the profile.
+    """
+    return directory / _UNSAFE_RE.sub("_", suite) / _UNSAFE_RE.sub("_", case)
+
+
+def _label(filename: str, line: int, name: str) -> str:
+    if filename == "~":  # Built-in functions
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def _run_cprofile(
+    fn: Callable[[], Any], path: Path, top: int
+) -> list[tuple[str, float, float]]:
+    profiler = cProfile.Profile()
+
+    try:
+        profiler.runcall(fn)
+    except Exception:  # The failure itself is reported by the validation
+        pass
+
+    stats = pstats.Stats(profiler)
+    stats.dump_stats(path.with_suffix(".pstats"))
+
+    entries = sorted(stats.stats.items(), key=lambda e: e[1][2], reverse=True)
+    return [
+        (_label(*function), own, cumulative)
+        for function, (_, _, own, cumulative, _) in entries[:top]
+    ]
+
+
+def _run_sampling(
+    fn: Callable[[], Any], path: Path, top: int
+) -> list[tuple[str, float, float]]:
+    thread = threading.get_ident()
+    stacks: Counter[tuple[str, ...]] = Counter()
+    done = threading.Event()
+    # Frames below the profiled call belong to pysvt and are left out of the stacks
+    depth = len(_stack(sys._getframe()))
+
+    def sample() -> None:
+        while not done.wait(SAMPLING_INTERVAL):
+            frame = sys._current_frames().get(thread)
+            if frame is not None:
+                stacks[_stack(frame)[depth:]] += 1
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+
+    try:
+        fn()
+    except Exception:  # The failure itself is reported by the validation
+        pass
+    finally:
+        done.set()
+        sampler.join()
+
+    own: Counter[str] = Counter()
+    cumulative: Counter[str] = Counter()
+
+    with open(path.with_suffix(".folded"), "w", encoding="utf-8") as f:
+        for stack, count in stacks.items():
+            if not stack:
+                continue
+
+            f.write(f"{';'.join(stack)} {count}\n")
+            own[stack[-1]] += count
+            for function in set(stack):
+                cumulative[function] += count
+
+    return [
+        (function, count * SAMPLING_INTERVAL, cumulative[function] * SAMPLING_INTERVAL)
+        for function, count in own.most_common(top)
+    ]
+
+
+def _stack(frame: Any) -> tuple[str, ...]:
+    functions = []
+
+    while frame is not None:
+        code = frame.f_code
+        functions.append(_label(code.co_filename, code.co_firstlineno, code.co_name))
+        frame = frame.f_back
+
+    return tuple(reversed(functions))
+
+
+def profile(
+    fn: Callable[[], Any], profiler: str, path: Path, top: int
+) -> list[tuple[str, float, float]]:
+    """
+    Calls the function under a profiler, writes the profile next to the given path and returns the hottest functions.
+
+    `cprofile` writes a `.pstats` file, which can be opened with `pstats` or `snakeviz`. `sampling` samples the
+    call stack every `SAMPLING_INTERVAL` seconds from another thread and writes a `.folded` file of collapsed
+    stacks, which can be turned into a flame graph by `flamegraph.pl` or speedscope. It only slows the function down
+    as much as the sampling thread competes for the GIL, but misses functions faster than the interval.
+
+    Exceptions raised by the function are ignored.
+
+    Args:
+        fn (Callable[[], Any]): The function to call.
+        profiler (str): One of "cprofile" or "sampling".
+        path (Path): The path of the profile, without suffix.
+        top (int): The number of hottest functions to return.
+
+    Returns:
+        list[tuple[str, float, float]]: The name, own time and cumulative time in seconds of the hottest functions,
+        by own time.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if profiler == "cprofile":
+        return _run_cprofile(fn, path, top)
+    return _run_sampling(fn, path, top)
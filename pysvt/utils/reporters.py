@@ -0,0 +1,196 @@
+import atexit
+import json
+import reprlib
+from pathlib import Path
+from typing import IO, Any
+from xml.sax.saxutils import escape, quoteattr
+
+from rich.text import Text
+
+from .models import Result, _FuncModel
+
+
+class Reporter:
+    """
+    Base class of the machine-readable result sinks, which receive every result alongside the `Printer`.
+
+    A reporter can be shared by several tests. It is closed automatically when the interpreter exits.
+
+    Args:
+        path (str | Path): The path of the output file, which is overwritten.
+        buffer_size (int): The number of results buffered before they are written. Default is 1000.
+
+    Methods:
+        start(suite: str) -> None:
+            Called before the test cases of a test are executed.
+
+        report(suite: str, res: Result, data: _FuncModel, time_taken: float) -> None:
+            Called with the result of every test case.
+
+        skip(suite: str, data: _FuncModel) -> None:
+            Called with every test case which is skipped, having passed in a previous run or after too many failures.
+
+        finish(suite: str, total: int, failures: int) -> None:
+            Called after all the test cases of a test are executed.
+
+        close() -> None:
+            Writes the remaining buffered results and closes the file.
+    """
+
+    def __init__(self, path: str | Path, buffer_size: int = 1000) -> None:
+        self.path = Path(path)
+        self.buffer_size = buffer_size
+        self._buffer: list[str] = []
+        self._file: IO[str] | None = None
+
+        atexit.register(self.close)
+
+    def start(self, suite: str) -> None:
+        pass
+
+    def report(
+        self, suite: str, res: Result, data: _FuncModel, time_taken: float
+    ) -> None:
+        pass
+
+    def skip(self, suite: str, data: _FuncModel) -> None:
+        pass
+
+    def finish(self, suite: str, total: int, failures: int) -> None:
+        pass
+
+    def close(self) -> None:
+        self._flush()
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, line: str) -> None:
+        self._buffer.append(line)
+
+        if len(self._buffer) >= self.buffer_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._open()
+
+        self._file.writelines(self._buffer)
+        self._file.flush()
+        self._buffer.clear()
+
+    def _open(self) -> None:
+        pass
+
+
+class JsonLinesReporter(Reporter):
+    """
+    Writes one JSON object per test case, with values which are not JSON serializable written as their repr.
+    """
+
+    def report(
+        self, suite: str, res: Result, data: _FuncModel, time_taken: float
+    ) -> None:
+        record: dict[str, Any] = {
+            "suite": suite,
+            "name": Text.from_markup(data.name).plain,
+            "status": res.status,
+            "valid": res.valid,
+            "time": time_taken,
+            "output": res.data,
+            "expected": data.output,
+            "stdout": res.stdout,
+        }
+
+        if res.stats is not None:
+            record["median"] = res.stats.median
+
+        self._write(json.dumps(record, default=repr) + "\n")
+
+    def skip(self, suite: str, data: _FuncModel) -> None:
+        record = {
+            "suite": suite,
+            "name": Text.from_markup(data.name).plain,
+            "status": "SKIPPED",
+        }
+        self._write(json.dumps(record) + "\n")
+
+
+class JUnitXmlReporter(Reporter):
+    """
+    Writes a JUnit XML report with one `testsuite` element per test and one `testcase` element per test case.
+
+    The test cases of a test are buffered until it finishes, since the `testsuite` element holds their totals.
+    Failure messages are truncated with `reprlib`.
+    """
+
+    def __init__(self, path: str | Path, buffer_size: int = 1000) -> None:
+        super().__init__(path, buffer_size)
+        self._cases: list[str] = []
+        self._errors = 0
+        self._skipped = 0
+        self._time = 0.0
+
+    def start(self, suite: str) -> None:
+        self._cases = []
+        self._errors = 0
+        self._skipped = 0
+        self._time = 0.0
+
+    def report(
+        self, suite: str, res: Result, data: _FuncModel, time_taken: float
+    ) -> None:
+        name = quoteattr(Text.from_markup(data.name).plain)
+        case = f'    <testcase classname={quoteattr(suite)} name={name} time="{time_taken:.6f}"'
+        self._time += time_taken
+
+        if res.valid:
+            self._cases.append(f"{case}/>\n")
+            return
+
+        kind = "error" if res.status != "OK" else "failure"
+        self._errors += res.status != "OK"
+        if res.mismatch is not None:
+            message = quoteattr(res.mismatch)
+        elif res.status == "OK":
+            message = quoteattr(
+                f"Expected {reprlib.repr(data.output)}, got {reprlib.repr(res.data)}"
+            )
+        else:
+            message = quoteattr(res.status)
+        body = escape(res.stdout or "")
+        self._cases.append(
+            f"{case}>\n      <{kind} message={message}>{body}</{kind}>\n    </testcase>\n"
+        )
+
+    def skip(self, suite: str, data: _FuncModel) -> None:
+        name = quoteattr(Text.from_markup(data.name).plain)
+        self._skipped += 1
+        self._cases.append(
+            f'    <testcase classname={quoteattr(suite)} name={name} time="0.000000">\n'
+            "      <skipped/>\n    </testcase>\n"
+        )
+
+    def finish(self, suite: str, total: int, failures: int) -> None:
+        self._write(
+            f'  <testsuite name={quoteattr(suite)} tests="{total + self._skipped}" failures="{failures - self._errors}"'
+            f' errors="{self._errors}" skipped="{self._skipped}" time="{self._time:.6f}">\n'
+        )
+        for case in self._cases:
+            self._write(case)
+        self._write("  </testsuite>\n")
+        self._cases = []
+
+    def close(self) -> None:
+        if self._file is not None or self._buffer:
+            self._write("</testsuites>\n")
+        super().close()
+
+    def _open(self) -> None:
+        self._file.write('<?xml version="1.0" encoding="utf-8"?>\n<testsuites>\n')
@@ -0,0 +1,302 @@
+import re
+from functools import lru_cache
+from typing import Any, Iterable
+
+from .compare import COMPARATORS
+from .models import _FixtureModel
+
+OUTPUT_RE = re.compile(r"^o(?:ut|utput|utputs)?$")
+INPUT_RE = re.compile(r"^i(?:n|nput|nputs)?$")
+# Options which can be set per test case in the data, overriding the decorator arguments, with their types
+CASE_OPTIONS: dict[str, type | tuple[type, ...]] = {
+    "timeout": (int, float),
+    "max_memory": int,
+    "max_peak_memory": int,
+    "profile": bool,
+    "compare": str,
+    "rel_tol": (int, float),
+    "abs_tol": (int, float),
+    "methods": list,
+}
+# Options which only take one of the given values
+CASE_CHOICES: dict[str, tuple[str, ...]] = {"compare": COMPARATORS}
+
+# The exact types of the options which need no further checks, so that valid test cases skip `_check_option`
+_VALID_TYPES = {
+    key: frozenset(kind if isinstance(kind, tuple) else (kind,))
+    for key, kind in CASE_OPTIONS.items()
+    if key not in CASE_CHOICES
+}
+
+
+class ValidationError(Exception):
+    def __init__(self, *args: object) -> None:
+        super().__init__(*args)
+
+
+@lru_cache(maxsize=256)
+def _resolve(keys: tuple[str, ...]) -> tuple[str | None, str | None]:
+    input_key = next((key for key in keys if INPUT_RE.match(key)), None)
+    output_key = next((key for key in keys if OUTPUT_RE.match(key)), None)
+    return input_key, output_key
+
+
+@lru_cache(maxsize=256)
+def _plan(
+    keys: tuple[str, ...]
+) -> tuple[str | None, str | None, bool, tuple[str, ...]]:
+    # Everything about a test case which only depends on its keys, shared by the test cases of the same shape
+    input_key, output_key = _resolve(keys)
+    optional = any(key in keys for key in ("metadata", "name", "init"))
+    options = tuple(key for key in CASE_OPTIONS if key in keys)
+    return input_key, output_key, optional, options
+
+
+def resolve_keys(data: dict[str, Any]) -> tuple[str | None, str | None]:
+    """
+    Finds the input and output keys among the keys of a test case (or of the whole test case data).
+
+    The aliases are matched once per distinct set of keys, which is shared by most test cases of a file.
+
+    Args:
+        data (dict[str, Any]): The test case.
+
+    Returns:
+        tuple[str | None, str | None]: The input key and the output key, if any.
+    """
+    return _resolve(tuple(data))
+
+
+def case_options(case: dict[str, Any], index: int | None = None) -> dict[str, Any]:
+    """
+    Returns the per test case options set in the case, checking their types and values.
+
+    Args:
+        case (dict[str, Any]): The test case.
+        index (int | None): The index of the test case, used in error messages. Default is None.
+
+    Returns:
+        dict[str, Any]: The options of the test case.
+
+    Raises:
+        ValidationError: If an option has the wrong type or value.
+    """
+    options = {}
+
+    for key in CASE_OPTIONS:
+        if key in case:
+            options[key] = _check_option(case[key], key, index)
+
+    return options
+
+
+def _location(key: str, index: int | None) -> str:
+    return f"`{key}`" if index is None else f"`{key}` of case {index + 1}"
+
+
+def _check(
+    value: Any, kind: type | tuple[type, ...], key: str, index: int | None
+) -> Any:
+    # Booleans are integers too, but never a valid number of seconds or bytes
+    if not isinstance(value, kind) or (isinstance(value, bool) and kind is not bool):
+        names = (
+            kind.__name__
+            if isinstance(kind, type)
+            else " or ".join(k.__name__ for k in kind)
+        )
+        raise ValidationError(
+            f"{_location(key, index)} should be of type {names}, got {type(value).__name__}"
+        )
+    return value
+
+
+def _check_option(value: Any, key: str, index: int | None) -> Any:
+    _check(value, CASE_OPTIONS[key], key, index)
+
+    if key in CASE_CHOICES and value not in CASE_CHOICES[key]:
+        raise ValidationError(
+            f"{_location(key, index)} should be one of {', '.join(CASE_CHOICES[key])}, got {value!r}"
+        )
+    return value
+
+
+def check_inputs(inputs: Any, key: str, index: int) -> Any:
+    """
+    Checks that the inputs of a test case, once preprocessed, are a list of arguments (or None without inputs).
+
+    Args:
+        inputs (Any): The preprocessed inputs of the test case.
+        key (str): The key holding the inputs, used in error messages.
+        index (int): The index of the test case, used in error messages.
+
+    Returns:
+        Any: The inputs.
+
+    Raises:
+        ValidationError: If the inputs are not a list.
+    """
+    if inputs is None or type(inputs) is list:
+        return inputs
+    return _check(inputs, list, key, index)
+
+
+def _normalize_cases(cases: Iterable[dict[str, Any]]) -> _FixtureModel:
+    input_key = None
+    inputs = []
+    outputs = []
+    metadata = []
+    name = []
+    init = []
+    options = []
+
+    for index, case in enumerate(cases):
+        case_key, output_key, optional, option_keys = _plan(tuple(case))
+
+        if output_key is None:
+            raise ValidationError(
+                f"No output data given or output key is invalid in case {index + 1}"
+            )
+
+        outputs.append(case[output_key])
+        inputs.append(None if case_key is None else case[case_key])
+        input_key = input_key or case_key
+
+        if optional:
+            # Type checks are inlined for valid values, as they run for every test case
+            value = case.get("metadata", "No metadata")
+            metadata.append(
+                value if type(value) is str else _check(value, str, "metadata", index)
+            )
+            value = case.get("name", "Test case")
+            name.append(
+                value if type(value) is str else _check(value, str, "name", index)
+            )
+            value = case.get("init", [])
+            init.append(
+                value if type(value) is list else _check(value, list, "init", index)
+            )
+        else:
+            metadata.append("No metadata")
+            name.append("Test case")
+            init.append([])
+
+        if option_keys:
+            option = {key: case[key] for key in option_keys}
+
+            for key, value in option.items():
+                if type(value) not in _VALID_TYPES.get(key, ()):
+                    _check_option(value, key, index)
+
+            options.append(option)
+        else:
+            options.append({})
+
+    return _FixtureModel(
+        inputs, outputs, metadata, name, init, options, input_key or "i"
+    )
+
+
+def _column(
+    data: dict[str, Any],
+    key: str,
+    default: Any,
+    kind: type | tuple[type, ...],
+    total: int,
+) -> list[Any]:
+    # A list gives the value of every test case, anything else is shared by all of them
+    if key not in data:
+        return [default] * total
+
+    value = data[key]
+    if not isinstance(value, list):
+        return [_check(value, kind, key, None)] * total
+
+    if len(value) > total:
+        raise ValidationError(
+            f"{key.capitalize()} and output data are not of the same length ({len(value)} and {total})"
+        )
+
+    for index, item in enumerate(value):
+        _check(item, kind, key, index)
+
+    # Shorter lists of names and metadata are padded with the default
+    return value + [default] * (total - len(value))
+
+
+def _normalize_flat(data: dict[str, Any]) -> _FixtureModel:
+    input_key, output_key = _resolve(tuple(data))
+
+    if output_key is None:
+        raise ValidationError("No output data given or output key is invalid")
+
+    outputs = _check(data[output_key], list, output_key, None)
+    total = len(outputs)
+
+    if input_key is None:
+        inputs = [None] * total
+    else:
+        inputs = _check(data[input_key], list, input_key, None)
+
+        if len(inputs) != total:
+            raise ValidationError(
+                f"Input and output data are not of the same length ({len(inputs)} and {total})"
+            )
+
+    if "init" in data and isinstance(data["init"], list) and len(data["init"]) != total:
+        raise ValidationError(
+            f"Init and output data are not of the same length ({len(data['init'])} and {total})"
+        )
+
+    metadata = _column(data, "metadata", "No metadata", str, total)
+    name = _column(data, "name", "Test case", str, total)
+    init = _column(data, "init", [], list, total)
+
+    options = [{} for _ in range(total)]
+    for key, kind in CASE_OPTIONS.items():
+        if key not in data:
+            continue
+
+        if isinstance(data[key], list) and len(data[key]) != total:
+            raise ValidationError(
+                f"{key.capitalize()} and output data are not of the same length ({len(data[key])} and {total})"
+            )
+
+        values = _column(data, key, None, kind, total)
+        if key in CASE_CHOICES:
+            shared = not isinstance(data[key], list)
+            for index, value in enumerate(values):
+                _check_option(value, key, None if shared else index)
+
+        for option, value in zip(options, values):
+            option[key] = value
+
+    return _FixtureModel(
+        inputs, outputs, metadata, name, init, options, input_key or "i"
+    )
+
+
+def normalize_fixture(data: dict[str, Any]) -> _FixtureModel:
+    """
+    Validates the test case data and resolves its keys into equally long lists, in a single pass over the test cases.
+
+    The data either holds a `cases` list of test case tables, or one list per key with an item per test case. Errors
+    name the offending key and, where applicable, the test case.
+
+    Args:
+        data (dict[str, Any]): The test case data.
+
+    Returns:
+        _FixtureModel: The normalized test case data.
+
+    Raises:
+        ValidationError: If the test case data is invalid.
+    """
+    if "cases" in data:
+        fixture = _normalize_cases(data["cases"])
+    else:
+        fixture = _normalize_flat(data)
+
+    if not fixture.outputs:
+        raise ValidationError("No output data given or output key is invalid")
+
+    return fixture
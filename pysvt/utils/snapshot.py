@@ -0,0 +1,147 @@
+import gzip
+import os
+import pickle
+import re
+import sys
+from pathlib import Path
+from typing import Any
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, gzip is used instead
+    zstandard = None
+
+# Suffixes of the snapshot files, in the order they are looked up
+SUFFIXES = (".npy", ".pkl.zst", ".pkl.gz")
+
+_UNSAFE_RE = re.compile(r"[^\w.-]+")
+
+
+def snapshot_key(output: Any) -> str | None:
+    """
+    Returns the key of the snapshot referenced by the expected output of a test case, such as `{ snapshot = "key" }`.
+
+    Args:
+        output (Any): The expected output of the test case.
+
+    Returns:
+        str | None: The key of the snapshot, or None if the output is not a reference.
+    """
+    if isinstance(output, dict) and len(output) == 1:
+        key = output.get("snapshot")
+        if isinstance(key, str):
+            return key
+    return None
+
+
+class SnapshotStore:
+    """
+    A directory holding the outputs of test cases, one compressed file per snapshot key.
+
+    NumPy arrays are written as `.npy` files, anything else as a pickle compressed with zstd (if the `zstandard`
+    package is installed) or gzip.
+
+    Args:
+        directory (Path): The directory holding the snapshots. It is created on the first save if it does not exist.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def _base(self, key: str) -> Path:
+        return self.directory / _UNSAFE_RE.sub("_", key)
+
+    def path(self, key: str) -> Path | None:
+        """
+        Returns the path of the snapshot file, if any.
+
+        Args:
+            key (str): The key of the snapshot.
+
+        Returns:
+            Path | None: The path of the snapshot file.
+        """
+        base = self._base(key)
+
+        for suffix in SUFFIXES:
+            path = base.with_name(base.name + suffix)
+            if path.exists():
+                return path
+        return None
+
+    def load(self, key: str) -> Any:
+        """
+        Loads a snapshot.
+
+        Args:
+            key (str): The key of the snapshot.
+
+        Returns:
+            Any: The recorded output.
+
+        Raises:
+            KeyError: If there is no snapshot with the given key.
+        """
+        path = self.path(key)
+
+        if path is None:
+            raise KeyError(key)
+
+        if path.suffix == ".npy":
+            import numpy as np
+
+            return np.load(path, allow_pickle=False)
+
+        if path.suffix == ".zst":
+            with open(path, "rb") as f:
+                reader = zstandard.ZstdDecompressor().stream_reader(f)
+                return pickle.load(reader)
+
+        with gzip.open(path, "rb") as f:
+            return pickle.load(f)
+
+    def save(self, key: str, output: Any) -> Path:
+        """
+        Records a snapshot, replacing any previous one with the same key.
+
+        Args:
+            key (str): The key of the snapshot.
+            output (Any): The output to record.
+
+        Returns:
+            Path: The path of the snapshot file.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        base = self._base(key)
+        # NumPy is optional and only imported once arrays exist, arrays are otherwise pickled like any other output
+        np = sys.modules.get("numpy")
+        if np is not None and isinstance(output, np.ndarray) and output.dtype != object:
+            suffix = ".npy"
+        elif zstandard is not None:
+            suffix = ".pkl.zst"
+        else:
+            suffix = ".pkl.gz"
+
+        path = base.with_name(base.name + suffix)
+        temp = base.with_name(f"{base.name}.{os.getpid()}.tmp")
+
+        if suffix == ".npy":
+            with open(temp, "wb") as f:
+                np.save(f, output, allow_pickle=False)
+        elif suffix == ".pkl.zst":
+            with open(temp, "wb") as f:
+                with zstandard.ZstdCompressor().stream_writer(f) as writer:
+                    pickle.dump(output, writer, pickle.HIGHEST_PROTOCOL)
+        else:
+            with gzip.open(temp, "wb", compresslevel=6) as f:
+                pickle.dump(output, f, pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temp, path)
+
+        # A snapshot recorded in another format would shadow or be shadowed by the new one
+        for other in SUFFIXES:
+            if other != suffix:
+                base.with_name(base.name + other).unlink(missing_ok=True)
+
+        return path
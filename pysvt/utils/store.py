@@ -0,0 +1,129 @@
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows, where concurrent saves are not serialized
+    fcntl = None
+
+
+def ignore_directory(directory: Path) -> None:
+    """
+    Creates a directory of pysvt, such as `.pysvt_cache`, along with a `.gitignore` file ignoring all of it.
+
+    Args:
+        directory (Path): The directory.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+
+    ignore = directory / ".gitignore"
+    if not ignore.exists():
+        ignore.write_text("# Created by pysvt automatically\n*\n")
+
+
+@contextmanager
+def atomic_open(path: Path, mode: str = "w") -> Iterator[IO]:
+    """
+    Opens a temporary file next to the given one, which replaces it once written, so that readers never see
+    a partially written file.
+
+    Args:
+        path (Path): The file to write.
+        mode (str): The mode to open the temporary file with, either "w" or "wb". Default is "w".
+
+    Yields:
+        IO: The temporary file.
+    """
+    temp = path.with_suffix(f".{os.getpid()}.tmp")
+    encoding = None if "b" in mode else "utf-8"
+
+    try:
+        with open(temp, mode, encoding=encoding) as f:
+            yield f
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+
+    os.replace(temp, path)
+
+
+@contextmanager
+def _locked(directory: Path) -> Iterator[None]:
+    # The directory is locked rather than the file, which is replaced by every save
+    if fcntl is None:
+        yield
+        return
+
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+class JsonStore:
+    """
+    A JSON file holding a format version and some data per suite, keyed by the qualified name of the tested
+    function. A missing, invalid or outdated file is read as empty.
+
+    Saving merges the suites changed since loading into the file as it is then, under a lock, so that processes
+    running different suites at the same time (like `python -m pysvt -j`) keep each other's changes.
+
+    Args:
+        path (Path): The path to the JSON file.
+    """
+
+    # Bump whenever the layout of the suites changes
+    _VERSION = 1
+    # Whether the file lives in a directory of pysvt, which is then ignored by git
+    _IGNORED = True
+    _INDENT: int | None = None
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._suites: dict[str, Any] = self._load()
+        self._changed: set[str] = set()
+
+    def _load(self) -> dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(data, dict) or data.get("version") != self._VERSION:
+            return {}
+        return data["suites"]
+
+    def _encode(self, suite: str) -> Any:
+        # The JSON value of a suite, overridden by stores holding values `json` cannot encode
+        return self._suites[suite]
+
+    def save(self) -> None:
+        """
+        Writes the changed suites to the file, if any, keeping the other suites of the file as they are.
+        """
+        if not self._changed:
+            return
+
+        if self._IGNORED:
+            ignore_directory(self.path.parent)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with _locked(self.path.parent):
+            suites = self._load()
+            suites.update((suite, self._encode(suite)) for suite in self._changed)
+
+            with atomic_open(self.path) as f:
+                json.dump(
+                    {"version": self._VERSION, "suites": suites},
+                    f,
+                    indent=self._INDENT,
+                )
+
+        self._changed.clear()
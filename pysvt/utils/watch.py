@@ -0,0 +1,182 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Iterable
+
+# Time to wait for more changes after the first one, as editors often write a file in several steps
+DEBOUNCE = 0.1
+POLL_INTERVAL = 0.5
+
+_IN_MODIFY = 0x2
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_EVENT = struct.Struct("iIII")
+
+
+def _inotify() -> ctypes.CDLL | None:
+    if not sys.platform.startswith("linux"):
+        return None
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1  # Missing on very old C libraries
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+def snapshot(paths: Iterable[Path]) -> dict[Path, int | None]:
+    """
+    Returns the modification times of files, to pass to a `Watcher` created after they were used.
+
+    Args:
+        paths (Iterable[Path]): The files.
+
+    Returns:
+        dict[Path, int | None]: The modification time in nanoseconds of every resolved path, None if it is missing.
+    """
+    mtimes: dict[Path, int | None] = {}
+
+    for path in paths:
+        path = Path(path).resolve()
+        try:
+            mtimes[path] = path.stat().st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+
+    return mtimes
+
+
+class Watcher:
+    """
+    Waits for changes of a set of files, with inotify on Linux and by polling their modification times elsewhere.
+
+    Changes are only seen once the watcher exists, unless the modification times of the files are taken with
+    `snapshot` before they are used, in which case the first `wait` returns the files changed since then.
+
+    Args:
+        paths (Iterable[Path]): The files to watch.
+        polling (bool): Flag indicating whether to poll even if inotify is available. Default is False.
+        interval (float): The time in seconds between two polls. Default is `POLL_INTERVAL`.
+        since (dict[Path, int | None] | None): The modification times returned by `snapshot`. Files missing from
+            it are only watched from now on. Default is None.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        polling: bool = False,
+        interval: float = POLL_INTERVAL,
+        since: dict[Path, int | None] | None = None,
+    ) -> None:
+        self.paths = {Path(path).resolve() for path in paths}
+        self._interval = interval
+        self._libc = None if polling else _inotify()
+        self._fd = -1
+        self._dirs: dict[int, Path] = {}
+        self._mtimes = self._stat()
+        # Changed before the watcher existed, returned by the next wait
+        self._pending = {
+            path
+            for path in self.paths
+            if path in (since or {}) and since[path] != self._mtimes[path]
+        }
+
+        if self._libc is None:
+            return
+
+        self._fd = self._libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self._fd < 0:
+            self._libc = None
+            return
+
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+        # Directories are watched rather than files, which editors replace by renaming a new file over them
+        for directory in {path.parent for path in self.paths}:
+            wd = self._libc.inotify_add_watch(self._fd, bytes(directory), mask)
+            if wd >= 0:
+                self._dirs[wd] = directory
+
+    def _stat(self) -> dict[Path, int | None]:
+        return snapshot(self.paths)
+
+    def _read(self, timeout: float | None) -> set[Path]:
+        changed: set[Path] = set()
+
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return changed
+
+        data = os.read(self._fd, 64 * 1024)
+        offset = 0
+
+        while offset < len(data):
+            wd, _, _, length = _EVENT.unpack_from(data, offset)
+            start = offset + _EVENT.size
+            offset = start + length
+
+            name = data[start:offset].rstrip(b"\0").decode(errors="surrogateescape")
+            path = self._dirs.get(wd, Path()) / name
+            if path in self.paths:
+                changed.add(path)
+
+        return changed
+
+    def wait(self) -> set[Path]:
+        """
+        Blocks until any of the files is modified, created, replaced or deleted, unless some changed already
+        since the snapshot the watcher was created with.
+
+        Returns:
+            set[Path]: The resolved paths of the changed files.
+        """
+        if self._pending:
+            changed, self._pending = self._pending, set()
+            return changed
+
+        while True:
+            if self._libc is not None:
+                changed = self._read(None)
+            else:
+                time.sleep(self._interval)
+                mtimes = self._stat()
+                changed = {
+                    path for path in self.paths if mtimes[path] != self._mtimes[path]
+                }
+                self._mtimes = mtimes
+
+            if not changed:
+                continue
+
+            time.sleep(DEBOUNCE)
+
+            if self._libc is not None:
+                changed |= self._read(0)
+            else:
+                mtimes = self._stat()
+                changed |= {
+                    path for path in self.paths if mtimes[path] != self._mtimes[path]
+                }
+                self._mtimes = mtimes
+
+            return changed
+
+    def close(self) -> None:
+        """
+        Releases the inotify instance, if any.
+        """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -1,6 +1,10 @@
 import pytest
+import pysvt
+import pysvt.runner
 from pysvt import test, ValidationError
 import json
+import os
+import sys
 import tomllib
 
 
@@ -45,3 +49,872 @@ def test_load_fn():
 
         o = [o1, o2]
         json.dump(o, f)
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread", "process"])
+def test_executor(executor, capsys):
+    data = {"i": [[1], [2], [3]], "o": [1, 2, 3]}
+
+    def echo(a: int) -> int:
+        print(a)
+        return a
+
+    test(data=data, executor=executor, workers=2)(echo)
+
+    out = capsys.readouterr().out
+    assert "SUCCESS | 3 passed | 0 failed" in out
+    assert (
+        out.index("Test case 1") < out.index("Test case 2") < out.index("Test case 3")
+    )
+
+
+def test_executor_class(capsys):
+    data = {"i": [[1], [2]], "o": [1, 2], "init": [[1], [2]]}
+
+    @test(data=data, method="sample", executor="thread")
+    class Counter:
+        def __init__(self, start: int) -> None:
+            self.count = start
+
+        def sample(self, a: int) -> int:
+            self.count += a
+            return self.count - a
+
+    assert "SUCCESS | 2 passed | 0 failed" in capsys.readouterr().out
+
+
+def test_invalid_executor():
+    with pytest.raises(ValueError):
+        test(data={"i": [[1]], "o": [1]}, executor="gpu")
+
+
+def sample_pair(a: int, b: int) -> int:
+    return a
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_json_lines(stream, capsys):
+    test(file="tests/data/cases.jsonl", stream=stream)(sample_pair)
+
+    assert "SUCCESS | 2 passed | 0 failed" in capsys.readouterr().out
+
+
+def test_stream_is_lazy(capsys):
+    consumed = []
+
+    def cases():
+        for i in range(3):
+            consumed.append(i)
+            yield {"i": [i], "o": i}
+
+    def check(a: int) -> int:
+        # Cases are pulled one at a time as they are executed
+        assert consumed == list(range(a + 1))
+        return a
+
+    test(data={"cases": cases()}, stream=True)(check)
+
+    assert "SUCCESS | 3 passed | 0 failed" in capsys.readouterr().out
+
+
+def test_fixture_cache(tmp_path, monkeypatch, capsys):
+    file = tmp_path / "cases.toml"
+    file.write_text("i = [[1], [2]]\no = [1, 2]\n")
+    cache = pysvt.fixture_cache
+    monkeypatch.setattr(cache, "directory", tmp_path / ".pysvt_cache")
+    hits, misses = cache.hits, cache.misses
+
+    test(file=file, cache=True)(sample)
+    test(file=file, cache=True)(sample)
+    assert (cache.hits - hits, cache.misses - misses) == (1, 1)
+
+    file.write_text("i = [[1], [2]]\no = [1, 3]\n")
+    test(file=file, cache=True)(sample)
+    assert cache.misses - misses == 2
+    assert "FAILURE | 1 passed | 1 failed" in capsys.readouterr().out
+
+    cache.invalidate()
+    assert list(cache.directory.glob("*.bin")) == []
+
+
+def test_lazy_run(monkeypatch, capsys):
+    monkeypatch.setattr(pysvt.runner, "registry", [])
+
+    test(data={"i": [[1]], "o": [1]}, run="lazy")(sample)
+    monkeypatch.setenv("PYSVT_RUN", "lazy")
+    test(data={"i": [[1]], "o": [2]})(sample)
+
+    assert capsys.readouterr().out == ""
+    assert pysvt.run_all() == (2, 1)
+
+
+@pytest.mark.parametrize("isolation", ["deepcopy", "pickle", "snapshot", "none"])
+def test_isolation(isolation, capsys):
+    data = {"i": [[[1, 2]]], "o": [2]}
+
+    def pop(xs: list) -> int:
+        return xs.pop()
+
+    test(data=data, isolation=isolation, detect_mutation=True)(pop)
+
+    out = capsys.readouterr().out
+    assert "xs - [1, 2]" in out if isolation != "none" else "xs - [1]" in out
+    assert "The inputs were mutated by the function" in out
+    assert data["i"] == ([[[1]]] if isolation in ("snapshot", "none") else [[[1, 2]]])
+
+
+def test_mutation_unpicklable(capsys):
+    def call(f, xs: list) -> int:
+        xs.append(lambda: None)
+        return f(1)
+
+    # Unpicklable inputs are not checked, and inputs made unpicklable count as mutated
+    data = {"i": [[lambda x: x, []], [abs, []]], "o": [1, 1]}
+    test(data=data, detect_mutation=True)(call)
+
+    out = capsys.readouterr().out
+    assert out.count("The inputs were mutated by the function") == 1
+    assert "SUCCESS | 2 passed | 0 failed" in out
+
+
+def test_snapshot_truncated(capsys):
+    def size(xs: list) -> int:
+        return len(xs)
+
+    # Large inputs are snapshot with the limits of the panels rather than rendered in full
+    data = {"i": [[list(range(100_000))]], "o": [0]}
+    test(data=data, isolation="snapshot", max_length=50)(size)
+
+    out = capsys.readouterr().out
+    assert "xs - [0, 1, 2" in out
+    assert "... (145 more" in out
+
+
+def test_benchmark(capsys):
+    test(data={"i": [[1], [2]], "o": [1, 2]}, benchmark=5, warmup=2)(sample)
+
+    out = capsys.readouterr().out
+    assert out.count("Benchmark - 5 runs") == 2
+    assert "Median" in out and "P95" in out
+
+
+def test_benchmark_stats():
+    from pysvt.utils.benchmark import summarize
+
+    stats = summarize([float(i) for i in range(1, 21)])
+    assert (stats.runs, stats.min, stats.median, stats.p95) == (20, 1.0, 10.5, 19.0)
+
+
+def test_baseline(tmp_path, capsys):
+    import time
+
+    file = tmp_path / "cases.toml"
+    file.write_text("i = [[0.02], [0.02]]\no = [0.02, 0.02]\n")
+
+    def sleep(seconds: float) -> float:
+        time.sleep(seconds)
+        return seconds
+
+    test(file=file, baseline=True)(sleep)
+    assert (tmp_path / "cases.baseline.json").exists()
+
+    file.write_text("i = [[0.02], [0.1]]\no = [0.02, 0.1]\n")
+    test(file=file, baseline=True, max_slowdown=2.0)(sleep)
+
+    out = capsys.readouterr().out
+    assert "FAILURE | 1 passed | 1 failed" in out
+    assert "Regressed test case" in out
+
+
+def test_limits(capsys):
+    import time
+
+    data = {
+        "cases": [
+            {"i": [0], "o": 0},
+            {"i": [5], "o": 5, "timeout": 0.2},
+            {"i": [-1], "o": -1, "max_memory": 50_000_000},
+        ]
+    }
+
+    def work(seconds: int) -> int:
+        if seconds < 0:
+            bytearray(10**9)
+        time.sleep(seconds)
+        return seconds
+
+    test(data=data, timeout=2)(work)
+
+    out = capsys.readouterr().out
+    assert "Test case 2 TIMEOUT" in out
+    assert "Test case 3 OOM" in out
+    assert "FAILURE | 1 passed | 2 failed" in out
+
+
+def test_error_status(capsys):
+    def fail(a: int) -> int:
+        raise TypeError("this is an error")
+
+    test(data={"i": [[1]], "o": [1]})(fail)
+
+    out = capsys.readouterr().out
+    assert "Test case 1 ERROR" in out
+    assert "FAILURE | 0 passed | 1 failed" in out
+
+
+def test_async(capsys):
+    import asyncio
+    import time
+
+    data = {"i": [[i] for i in range(5)], "o": list(range(5))}
+
+    async def echo(a: int) -> int:
+        print(a)
+        await asyncio.sleep(0.1)
+        return a
+
+    start = time.perf_counter()
+    test(data=data, concurrency=5)(echo)
+
+    assert time.perf_counter() - start < 0.4
+    out = capsys.readouterr().out
+    assert "SUCCESS | 5 passed | 0 failed" in out
+    assert out.index("Test case 1") < out.index("Test case 5")
+
+    for options in ({"executor": "thread"}, {"max_memory": 2**30}):
+        with pytest.raises(ValueError) as error:
+            test(data=data, **options)(echo)
+        assert "not supported for coroutine functions" in str(error.value)
+
+
+def test_batch(capsys):
+    calls = []
+
+    def add(a, b):
+        calls.append(len(a))
+        return [x + y for x, y in zip(a, b)]
+
+    test(data={"i": [[1, 2], [3, 4], [5, 6]], "o": [3, 7, 10]}, batch=True)(add)
+
+    assert calls == [3]
+    assert "FAILURE | 2 passed | 1 failed" in capsys.readouterr().out
+
+    def total(xs):
+        return [sum(x) for x in xs]
+
+    # Lists of different lengths do not make an array, so the column stays a list
+    test(data={"i": [[[1, 2]], [[3]], [[4, 5, 6]]], "o": [3, 3, 15]}, batch=True)(total)
+    assert "SUCCESS | 3 passed | 0 failed" in capsys.readouterr().out
+
+
+def test_batch_compare():
+    from pysvt.utils.batch import compare
+
+    assert compare([[1, 2], [3, 4]], [[1, 2], [3, 5]]) == [True, False]
+    assert compare([[1], [2, 3]], [[1], [2, 3]]) == [True, True]
+    # Mixed types are compared like `==` rather than converted to a common type
+    assert compare(["1", "2"], ["1", 2]) == [True, False]
+    assert compare([1, 2], [1, "x"]) == [True, False]
+    assert compare([1, 2], [1.0, 2.5]) == [True, False]
+
+
+def test_lazy_numpy():
+    import subprocess
+
+    # NumPy is only imported by the batches, array comparisons and snapshots needing it
+    code = "import sys, pysvt; print('numpy' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_locals(capsys):
+    from pysvt.utils.validation import get_result_locals
+
+    def countdown(n: int) -> int:
+        depth = n
+        return 0 if n == 0 else countdown(n - 1) + 1
+
+    result, local_vars, overhead = get_result_locals(countdown, 3)
+    assert result == 3
+    assert (local_vars["n"], local_vars["depth"]) == (3, 3)
+    assert overhead >= 0
+
+    test(data={"i": [[2]], "o": [2]}, show_locals=True)(countdown)
+    assert "Local variables - (captured in" in capsys.readouterr().out
+
+
+def test_reporters(tmp_path, capsys):
+    from xml.etree import ElementTree
+
+    junit = pysvt.JUnitXmlReporter(tmp_path / "report.xml")
+    json_lines = pysvt.JsonLinesReporter(tmp_path / "report.jsonl", buffer_size=1)
+    data = {"i": [[1], [2]], "o": [1, 3]}
+
+    test(data=data, reporters=[junit, json_lines], output="summary")(sample)
+    test(data=data, reporters=[junit, json_lines], output="quiet")(sample)
+    junit.close()
+    json_lines.close()
+
+    assert capsys.readouterr().out.count("FAILURE | 1 passed | 1 failed") == 1
+
+    suites = ElementTree.parse(tmp_path / "report.xml").getroot()
+    assert [suite.get("failures") for suite in suites] == ["1", "1"]
+
+    records = (tmp_path / "report.jsonl").read_text().splitlines()
+    assert [json.loads(record)["valid"] for record in records] == [True, False] * 2
+
+    # Long outputs are truncated in the failure message, and skipped test cases are reported as such
+    junit = pysvt.JUnitXmlReporter(tmp_path / "skipped.xml")
+    data = {"i": [[1], [2], [3]], "o": [list(range(1000)), 2, 3]}
+    test(data=data, reporters=[junit], output="quiet", max_failures=1)(sample)
+    junit.close()
+
+    suite = ElementTree.parse(tmp_path / "skipped.xml").getroot()[0]
+    assert (suite.get("tests"), suite.get("failures"), suite.get("skipped")) == (
+        "3",
+        "1",
+        "2",
+    )
+    assert len(suite[0].find("failure").get("message")) < 100
+    assert [case.find("skipped") is not None for case in suite] == [False, True, True]
+
+
+def test_error_only(capsys):
+    def sample(a: list[int]) -> int:
+        return len(a)
+
+    data = {"i": [[[1]], [list(range(10000))]], "o": [1, 0]}
+    test(data=data, error_only=True, max_length=100)(sample)
+
+    out = capsys.readouterr().out
+    assert out.count("Actual output") == 1
+    assert "9999" not in out
+    assert "FAILURE | 1 passed | 1 failed" in out
+
+
+def test_incremental(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+
+    def sample(a: int) -> int:
+        return a + 1
+
+    data = {"i": [[1], [2]], "o": [2, 4]}
+    test(data=data, incremental=True)(sample)
+    assert "FAILURE | 1 passed | 1 failed" in capsys.readouterr().out
+
+    test(data=data, incremental=True)(sample)
+    assert "FAILURE | 0 passed | 1 failed | 1 skipped" in capsys.readouterr().out
+
+    monkeypatch.setenv("PYSVT_FORCE", "1")
+    test(data=data, incremental=True)(sample)
+    assert "FAILURE | 1 passed | 1 failed" in capsys.readouterr().out
+    monkeypatch.delenv("PYSVT_FORCE")
+
+    def sample(a: int) -> int:
+        return a + 2
+
+    test(data=data, incremental=True)(sample)
+    assert "FAILURE | 1 passed | 1 failed\n" in capsys.readouterr().out
+
+
+def test_store_merge(tmp_path):
+    from pysvt.utils.history import HistoryStore
+
+    path = tmp_path / "history.json"
+    first, second = HistoryStore(path), HistoryStore(path)
+
+    # Like two processes of `python -m pysvt -j` running different suites
+    first.set("first", "Test case", False, 0.5)
+    second.set("second", "Test case", True, 1.5)
+    first.save()
+    second.save()
+
+    suites = json.loads(path.read_text())["suites"]
+    assert suites == {
+        "first": {"Test case": [False, 0.5]},
+        "second": {"Test case": [True, 1.5]},
+    }
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread"])
+def test_fail_fast(executor, capsys):
+    executed = []
+
+    def record(a: int) -> int:
+        executed.append(a)
+        return 0
+
+    data = {"i": [[i] for i in range(20)], "o": [0, 1, 2] + [0] * 17}
+    test(data=data, executor=executor, workers=1, max_failures=2)(record)
+
+    out = capsys.readouterr().out
+    assert "FAILURE | 1 passed | 2 failed | 17 skipped" in out
+    assert len(executed) < 20
+
+
+def test_fail_fast_lazy(capsys):
+    expected = []
+
+    def reference(a: int) -> int:
+        expected.append(a)
+        return a
+
+    def inputs(rng):
+        return [rng.randint(0, 10)]
+
+    def wrong(a: int) -> int:
+        return -1
+
+    # The remaining generated test cases are skipped without running the reference on them
+    test(
+        generate=inputs,
+        reference=reference,
+        examples=100_000,
+        shrink=False,
+        max_failures=1,
+        output="summary",
+    )(wrong)
+
+    assert "FAILURE | 0 passed | 1 failed | 99999 skipped" in capsys.readouterr().out
+    assert len(expected) == 1
+
+
+def test_order_failures(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    executed = []
+
+    def record(a: int) -> int:
+        executed.append(a)
+        return a
+
+    test(data={"i": [[1], [2], [3]], "o": [1, 2, 4]}, order="failures")(record)
+    executed.clear()
+    test(data={"i": [[1], [2], [3]], "o": [1, 2, 3]}, order="failures")(record)
+
+    assert executed[0] == 3
+    assert "SUCCESS | 3 passed | 0 failed" in capsys.readouterr().out
+
+
+def test_generate(capsys):
+    def buggy_max(xs: list[int]) -> int:
+        return max(xs) if len(xs) < 3 else xs[0]
+
+    def reference(xs: list[int]) -> int:
+        return max(xs)
+
+    def inputs(rng):
+        return [[rng.randint(-100, 100) for _ in range(rng.randint(1, 20))]]
+
+    test(generate=inputs, reference=max, examples=50, output="summary")(reference)
+    assert "SUCCESS | 50 passed | 0 failed" in capsys.readouterr().out
+
+    spec = {"i": {"type": "list[int]", "len": [1, 20], "min": 0}, "examples": 30}
+    test(data=spec, generate=True, reference=reference, error_only=True)(buggy_max)
+
+    out = capsys.readouterr().out
+    assert "(shrunk)" in out
+    # Failing lists shrink down to three items with the maximum last
+    assert "xs - [0, 0, 1]" in out
+    assert "30 passed" not in out
+
+    def crashing_max(xs: list[int]) -> int:
+        if len(xs) >= 3:
+            raise IndexError("too long")
+        return max(xs)
+
+    spec = {"i": {"type": "list[int]", "len": [1, 20], "min": 0}, "examples": 10}
+    test(data=spec, generate=True, reference=reference, error_only=True)(crashing_max)
+
+    out = capsys.readouterr().out
+    failed = int(out.split(" failed")[0].rsplit("| ", 1)[1])
+    # Only the traceback of every shrunk test case is printed, not those of the shrinking trials
+    assert failed > 1
+    assert out.count("Traceback") == failed
+    assert "xs - [0, 0, 0]" in out
+
+
+def test_complexity_fit():
+    from pysvt.utils.complexity import fit, normalize
+
+    sizes = [2**k for k in range(4, 12)]
+    assert fit(sizes, [1e-6 * n + 1e-5 for n in sizes]) == "O(n)"
+    assert fit(sizes, [1e-9 * n * n for n in sizes]) == "O(n^2)"
+    assert fit(sizes, [1e-6 for _ in sizes]) == "O(1)"
+    assert normalize("O(n²)") == "O(n^2)"
+
+
+def test_complexity(capsys):
+    def pairs(xs: list[int]) -> int:
+        return sum(1 for a in xs for b in xs if a < b)
+
+    test(
+        sized_inputs=lambda n: [list(range(n))],
+        sizes=[20, 40, 80, 160, 320],
+        complexity="O(n log n)",
+        benchmark=3,
+    )(pairs)
+
+    out = capsys.readouterr().out
+    assert "Time complexity - O(n^2) (bound O(n log n))" in out
+    assert "FAILURE | 0 passed | 1 failed" in out
+
+
+def test_profile_memory(capsys):
+    data = {
+        "cases": [
+            {"i": [10], "o": 10},
+            {"i": [1_000_000], "o": 1_000_000, "max_peak_memory": 100_000},
+        ]
+    }
+
+    def allocate(n: int) -> int:
+        return len(bytearray(n))
+
+    test(data=data, profile_memory=True)(allocate)
+
+    out = capsys.readouterr().out
+    assert out.count("Peak memory:") == 2
+    assert "Net retained memory" in out
+    assert "FAILURE | 1 passed | 1 failed" in out
+
+    # Isolating the inputs is not counted against the function
+    def size(xs: list[int]) -> int:
+        return len(xs)
+
+    data = {"i": [[list(range(100_000))]], "o": [100_000], "max_peak_memory": 10_000}
+    test(data=data, profile_memory=True)(size)
+    assert "SUCCESS | 1 passed" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("profiler", ["cprofile", "sampling"])
+def test_profile(profiler, tmp_path, capsys):
+    import time
+
+    def slow(seconds: float) -> float:
+        time.sleep(seconds)
+        return seconds
+
+    data = {"i": [[0.0], [0.05]], "o": [0.0, 0.05]}
+    test(
+        data=data,
+        profile="slow",
+        profile_slow=0.03,
+        profiler=profiler,
+        profile_dir=tmp_path,
+    )(slow)
+
+    suffix = ".pstats" if profiler == "cprofile" else ".folded"
+    assert [path.name for path in tmp_path.rglob("*.*")] == [f"Test_case_2{suffix}"]
+
+    out = capsys.readouterr().out
+    assert out.count("Profile -") == 1
+    assert "slow (test_func.py" in out
+
+    # A test case stopped by its timeout is not run again without it
+    start = time.perf_counter()
+    test(
+        data={"i": [[3.0]], "o": [3.0]},
+        timeout=0.2,
+        profile="failing",
+        profiler=profiler,
+        profile_dir=tmp_path / "timeout",
+    )(slow)
+
+    assert time.perf_counter() - start < 2
+    assert "Profile -" not in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "data,message",
+    [
+        (
+            {"cases": [{"i": [1], "o": 1}, {"i": [2], "o": 2, "name": 5}]},
+            "`name` of case 2 should be of type str, got int",
+        ),
+        (
+            {"cases": [{"i": [1], "o": 1, "timeout": True}]},
+            "`timeout` of case 1 should be of type int or float, got bool",
+        ),
+        ({"cases": [{"i": [1]}]}, "output key is invalid in case 1"),
+        (
+            {"cases": [{"i": [1], "o": 1}, {"i": 5, "o": 5}]},
+            "`i` of case 2 should be of type list, got int",
+        ),
+        (
+            {"input": [[1], 2], "o": [1, 2]},
+            "`input` of case 2 should be of type list, got int",
+        ),
+        ({"i": [[1], [2]], "o": [1]}, "not of the same length (2 and 1)"),
+        (
+            {"i": [[1]], "o": [1], "metadata": ["a", 1]},
+            "Metadata and output data are not of the same length",
+        ),
+    ],
+)
+def test_schema_errors(data, message):
+    with pytest.raises(ValidationError) as error:
+        test(data=data)(sample)
+
+    assert message in str(error.value)
+
+
+def test_preprocessed_inputs(capsys):
+    # Inputs are checked once preprocessed, which may wrap them in a list
+    test(data={"i": [1, 2], "o": [1, 2]}, preprocess=lambda i: [i])(sample)
+    assert "SUCCESS | 2 passed | 0 failed" in capsys.readouterr().out
+
+    with pytest.raises(ValidationError) as error:
+        test(data={"cases": iter([{"i": 5, "o": 5}])}, stream=True)(sample)
+    assert "`i` of case 1 should be of type list, got int" in str(error.value)
+
+
+def test_compare(capsys):
+    from pysvt.utils.compare import output_digest
+
+    def stats(a: list[float]) -> list[float]:
+        return [sum(a) / len(a), max(a)]
+
+    test(data={"i": [[[0.1, 0.2]]], "o": [[0.15, 0.2]]}, rel_tol=1e-6)(stats)
+    test(data={"i": [[[0.1, 0.2]]], "o": [[0.15, 0.2]]})(stats)
+
+    def unique(a: list[int]) -> list[int]:
+        return list(set(a))
+
+    data = {
+        "cases": [
+            {"i": [[3, 1, 3, 2]], "o": [2, 3, 1], "compare": "unordered"},
+            {
+                "i": [list(range(1000))],
+                "o": output_digest(list(range(1000))),
+                "compare": "digest",
+            },
+            {"i": [[5, 6]], "o": [5, 7], "compare": "unordered"},
+            {"i": [[1]], "o": "9f86d081884c", "compare": "digest"},
+        ]
+    }
+    test(data=data)(unique)
+
+    out = capsys.readouterr().out
+    assert "SUCCESS | 1 passed" in out
+    assert "Mismatch - [0]: expected 0.15, got 0.15000000000000002" in out
+    assert "Mismatch - output: expected 1 of 7, got 0" in out
+    assert "should be `<algorithm>:<hex digest>`" in out
+    assert "FAILURE | 2 passed | 2 failed" in out
+
+    with pytest.raises(ValidationError):
+        test(data={"cases": [{"i": [[1]], "o": [1], "compare": "sorted"}]})(unique)
+
+
+def test_snapshots(tmp_path, monkeypatch, capsys):
+    def squares(n: int) -> list[int]:
+        return [i * i for i in range(n)]
+
+    data = {"i": [[1000]], "o": [{"snapshot": "squares"}]}
+    snapshots = tmp_path / "snapshots"
+
+    test(data=data, snapshots=snapshots)(squares)
+    out = capsys.readouterr().out
+    assert "Snapshot - recorded to" in out
+    assert "SUCCESS | 1 passed" in out
+    assert len(list(snapshots.glob("squares.pkl.*"))) == 1
+
+    test(data=data, snapshots=snapshots)(squares)
+    out = capsys.readouterr().out
+    assert "Snapshot" not in out
+    assert "SUCCESS | 1 passed" in out
+
+    data = {"i": [[999]], "o": [{"snapshot": "squares"}]}
+    test(data=data, snapshots=snapshots)(squares)
+    assert "expected length 1000, got 999" in capsys.readouterr().out
+
+    monkeypatch.setenv("PYSVT_UPDATE", "1")
+    test(data=data, snapshots=snapshots)(squares)
+    assert "SUCCESS | 1 passed" in capsys.readouterr().out
+
+
+def test_snapshots_numpy(tmp_path, capsys):
+    np = pytest.importorskip("numpy")
+
+    def grid(n: int):
+        return np.arange(n * n).reshape(n, n)
+
+    data = {"i": [[3]], "o": [{"snapshot": "grid"}]}
+    snapshots = tmp_path / "snapshots"
+
+    test(data=data, snapshots=snapshots)(grid)
+    assert "SUCCESS | 1 passed" in capsys.readouterr().out
+    assert (snapshots / "grid.npy").exists()
+
+    test(data=data, snapshots=snapshots)(grid)
+    out = capsys.readouterr().out
+    assert "Snapshot" not in out
+    assert "SUCCESS | 1 passed" in out
+
+    data = {"i": [[2]], "o": [{"snapshot": "grid"}]}
+    test(data=data, snapshots=snapshots)(grid)
+    assert "expected shape (3, 3), got (2, 2)" in capsys.readouterr().out
+
+
+class Stack:
+    instances = 0
+
+    def __init__(self, capacity: int) -> None:
+        Stack.instances += 1
+        self.capacity = capacity
+        self.items = []
+
+    def push(self, item: int) -> int:
+        self.items.append(item)
+        return len(self.items)
+
+    def pop(self) -> int:
+        return self.items.pop()
+
+    def clear(self) -> None:
+        self.items = []
+
+
+@pytest.mark.parametrize(
+    "reuse_instance,instances", [("per_case", 3), ("per_init", 2), ("per_suite", 1)]
+)
+def test_reuse_instance(reuse_instance, instances, capsys):
+    Stack.instances = 0
+    data = {
+        "cases": [
+            {
+                "init": [10],
+                "methods": ["push", "push", "pop"],
+                "i": [[1], [2], []],
+                "o": [1, 2, 2],
+            },
+            {"init": [10], "methods": ["push", "pop"], "i": [[3], []], "o": [1, 3]},
+            {"init": [20], "i": [4], "o": 1},
+        ]
+    }
+    test(data=data, method="push", reuse_instance=reuse_instance, reset="clear")(Stack)
+
+    out = capsys.readouterr().out
+    assert "SUCCESS | 3 passed" in out
+    assert "push - [2]" in out
+    assert Stack.instances == instances
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"executor": "process"}, {"timeout": 1.0}, {"benchmark": True}, {"profile": True}],
+)
+def test_reuse_instance_unsupported(options):
+    with pytest.raises(ValueError):
+        test(
+            data={"init": [[10]], "i": [[1]], "o": [1]},
+            method="push",
+            reuse_instance="per_suite",
+            **options,
+        )
+
+    data = {"cases": [{"init": [10], "i": [1], "o": 1, "max_memory": 10**9}]}
+    with pytest.raises(ValidationError) as error:
+        test(data=data, method="push", reuse_instance="per_suite")(Stack)
+    assert "not supported with reused instances" in str(error.value)
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_cli(jobs, tmp_path, monkeypatch, capsys):
+    from pysvt.cli import main
+
+    package = tmp_path / f"suites_{jobs}"
+    (package / "nested").mkdir(parents=True)
+    # Only mentions the decorator, so it is not discovered
+    (package / "helpers.py").write_text(
+        '"""\n@test(...) functions use it.\n"""\n\ndef double(a):\n    return a * 2\n'
+    )
+
+    for name, output in (("first", 2), ("nested/second", 3)):
+        # Absolute, as the in-process reporters are only closed at exit, after `chdir` is undone
+        report = (tmp_path / f"{package.name}_{name.split('/')[-1]}.xml").as_posix()
+        (package / f"{name}.py").write_text(
+            "from pysvt import JUnitXmlReporter, test\n\n"
+            f'@test(data={{"name": ["double one", "double two"], "i": [[1], [2]], "o": [{output}, 4]}}, '
+            f'reporters=[JUnitXmlReporter("{report}")])\n'
+            f"def {name.split('/')[-1]}(a: int) -> int:\n"
+            "    return a * 2\n"
+        )
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(pysvt.runner, "registry", [])
+    # Set so that teardown restores them, as `main` sets them for the tests it imports
+    monkeypatch.setenv("PYSVT_RUN", "lazy")
+    monkeypatch.setenv("PYSVT_KEYWORD", "")
+
+    with pytest.raises(SystemExit) as exit:
+        main([package.name, "-j", jobs])
+
+    out = capsys.readouterr().out
+    assert exit.value.code == 1
+    assert "2 tests in 2 modules" in out
+    assert "FAILURE | 3 passed | 1 failed" in out
+    # Worker processes exit without `atexit`, so they close the reporters themselves
+    if jobs == "2":
+        assert sorted(path.name for path in tmp_path.glob("*.xml")) == [
+            "suites_2_first.xml",
+            "suites_2_second.xml",
+        ]
+
+    # Imported modules are not imported again, and their tests keep the options they were decorated with
+    for module in [m for m in sys.modules if m.startswith(package.name)]:
+        monkeypatch.delitem(sys.modules, module)
+
+    with pytest.raises(SystemExit) as exit:
+        main([package.name, "-j", jobs, "-k", "double t*"])
+
+    out = capsys.readouterr().out
+    assert exit.value.code == 0
+    assert "double one" not in out
+    assert "SUCCESS | 2 passed | 0 failed" in out
+
+
+def test_discovery():
+    from pathlib import Path
+    from pysvt.utils.discovery import discover, has_tests
+
+    assert has_tests(b"import pysvt\n\n@pysvt.test(data={})\ndef f(a):\n    pass\n")
+    assert has_tests(b"class A:\n    @test\n    def f(self):\n        pass\n")
+    assert not has_tests(b'"""\n@test(data={})\n"""\n# @test\n')
+    assert not has_tests(b"@test(\n")
+
+    # The sources of pysvt itself mention `@test` in docstrings
+    root = Path(pysvt.__file__).parent.parent
+    assert not any(module.startswith("pysvt") for module in discover([str(root)]))
+
+
+@pytest.mark.parametrize("polling", [False, True])
+def test_watcher(polling, tmp_path):
+    import threading
+    from pysvt.utils.watch import Watcher, snapshot
+
+    fixture = tmp_path / "data.toml"
+    other = tmp_path / "other.toml"
+    fixture.write_text("o = [1]\n")
+    other.write_text("o = [1]\n")
+
+    def edit():
+        other.write_text("o = [2]\n")
+        # Editors often replace the file with a renamed copy
+        temp = tmp_path / "data.toml.tmp"
+        temp.write_text("o = [2]\n")
+        temp.replace(fixture)
+
+    with Watcher([fixture], polling=polling, interval=0.05) as watcher:
+        timer = threading.Timer(0.1, edit)
+        timer.start()
+        changed = watcher.wait()
+        timer.join()
+
+    assert changed == {fixture.resolve()}
+
+    # Changes made before the watcher exists are returned, if it knows the modification times from before
+    mtimes = snapshot([fixture, other])
+    os.utime(fixture, ns=(0, 0))
+
+    with Watcher([fixture, other], polling=polling, since=mtimes) as watcher:
+        assert watcher.wait() == {fixture.resolve()}